@@ -0,0 +1,52 @@
+"""
+Account Cache - Short-lived snapshot of exchange account state
+
+Equity and open positions are read at the top of every live-loop tick, but
+they only change when a trade executes. The cache reuses the last snapshot
+for a few seconds and is invalidated by the loop whenever it opens or
+closes a position.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class AccountCache:
+    """TTL cache over an exchange client's account() and positions()."""
+
+    def __init__(self, ex: Any, ttl: float = 5.0):
+        """
+        Args:
+            ex: Exchange client (HyperliquidClient or PaperExchange)
+            ttl: Seconds a snapshot stays valid
+        """
+        self.ex = ex
+        self.ttl = ttl
+        self._ts: Optional[float] = None
+        self._account: Dict[str, Any] = {}
+        self._positions: List[Dict[str, Any]] = []
+
+    def invalidate(self) -> None:
+        """Force the next get() to hit the exchange (call after any trade)."""
+        self._ts = None
+
+    async def get(self, force: bool = False) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Return (account, positions), refreshing when stale or forced.
+
+        The exchange clients are synchronous, so the reads run in worker
+        threads. When the account response carries the raw exchange state
+        (Hyperliquid), positions are parsed from it instead of being queried
+        a second time.
+        """
+        if force or self._ts is None or time.monotonic() - self._ts > self.ttl:
+            account = await asyncio.to_thread(self.ex.account)
+            raw_state = account.get("raw_state")
+            if raw_state is not None:
+                positions = self.ex.positions(raw_state)
+            else:
+                positions = await asyncio.to_thread(self.ex.positions)
+            self._account, self._positions = account, positions
+            self._ts = time.monotonic()
+        return self._account, self._positions
@@ -1,12 +1,19 @@
 import httpx
 import base64
+import orjson
 from typing import Any, Dict, List, Optional
 from io import BytesIO
+import numpy as np
 import pandas as pd
+import matplotlib
+# Charts are only rendered to a buffer, and fetch_signal runs in a worker
+# thread: use the non-GUI backend
+matplotlib.use("Agg")
 import mplfinance as mpf
 from datetime import datetime
 
 from .history_store import HistoryStore
+from .indicators import candles_to_array, candle_timestamps, OPEN, HIGH, LOW, CLOSE
 from .fractal_brain import NestedFractalBrain
 from .multi_timeframe import MultiTimeframeAnalyzer
 from .volatility_gate import VolatilityGate
@@ -90,26 +97,33 @@ class AISignalClient:
             time_stop_candles=time_stop_candles,
             atr_period=atr_period
         )
+        
+        # One pooled client for the Anthropic and Venice calls, so each signal
+        # reuses a warm keep-alive connection instead of a fresh TCP/TLS handshake
+        self._http = httpx.Client(timeout=15, limits=httpx.Limits(max_keepalive_connections=2))
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._http.close()
 
     def _get_chart_image(self, candles: List[Dict[str, Any]]) -> Optional[str]:
         """Generate candlestick chart from candle data and return base64 encoded image"""
         try:
-            # Convert candles to DataFrame for mplfinance
-            df_data = []
-            for candle in candles:
-                # Support both 'ts' and 'time' keys for timestamp
-                timestamp = candle.get('ts', candle.get('time', 0))
-                df_data.append({
-                    'Date': datetime.fromtimestamp(timestamp / 1000),
-                    'Open': float(candle['open']),
-                    'High': float(candle['high']),
-                    'Low': float(candle['low']),
-                    'Close': float(candle['close']),
-                    'Volume': float(candle['volume'])
-                })
-            
-            df = pd.DataFrame(df_data)
-            df.set_index('Date', inplace=True)
+            # Convert candles to DataFrame for mplfinance, column by column
+            # from the parsed OHLC array rather than one row dict per candle
+            ohlc = candles_to_array(candles)
+            # candle_timestamps supports both 'ts' and 'time' keys
+            dates = [datetime.fromtimestamp(ts / 1000) for ts in candle_timestamps(candles).tolist()]
+            df = pd.DataFrame(
+                {
+                    'Open': ohlc[:, OPEN],
+                    'High': ohlc[:, HIGH],
+                    'Low': ohlc[:, LOW],
+                    'Close': ohlc[:, CLOSE],
+                    'Volume': np.array([c['volume'] for c in candles], dtype=np.float64),
+                },
+                index=pd.DatetimeIndex(dates, name='Date'),
+            )
             
             # Create chart
             buf = BytesIO()
@@ -220,20 +234,12 @@ class AISignalClient:
         
         # 4️⃣ NESTED FRACTAL DETECTION (MANDATORY - 15m chart)
         print("\n🧠 FRACTAL BRAIN: Analyzing 15m chart for nested fractal patterns...")
-        import signal
-        
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Fractal brain analysis timed out")
-        
-        # Set 5 second timeout for fractal analysis
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(5)
-        
         # Analyze 15m chart for nested fractals (use 15m candles if available, else 5m)
         fractal_candles = candles_15m if candles_15m else candles
         try:
-            fractal_analysis = self.fractal_brain.analyze(fractal_candles)
-            signal.alarm(0)  # Cancel alarm
+            # 5 second budget, enforced inside the search rather than with
+            # SIGALRM so the client can run off the main thread
+            fractal_analysis = self.fractal_brain.analyze(fractal_candles, timeout=5)
             
             if fractal_analysis['fractals_found']:
                 print(f"✅ Found {fractal_analysis['pattern_count']} nested fractal pattern(s)!")
@@ -253,7 +259,6 @@ class AISignalClient:
                     "reason": f"FRACTAL FILTER: {fractal_analysis['reason']}"
                 }
         except TimeoutError:
-            signal.alarm(0)
             print("   ❌ Fractal brain timeout (>5s) - NO TRADES")
             print("="*80 + "\n")
             return {
@@ -493,10 +498,10 @@ Return your trading decision as JSON:"""
             "anthropic-version": "2023-06-01",
         }
         
-        with httpx.Client(timeout=15) as client:
-            resp = client.post(self.endpoint, headers=headers, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
+        # orjson encodes the request (including the base64 chart) in C
+        resp = self._http.post(self.endpoint, headers=headers, content=orjson.dumps(payload), timeout=15)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
         # Expecting the model to return a JSON string in content
         content = data.get("content", [])
         if not content:
@@ -508,7 +513,6 @@ Return your trading decision as JSON:"""
         print(combined)
         print(f"{'='*80}\n")
         try:
-            import json
             import re
 
             # Extract JSON object from response (handles prose before/after)
@@ -520,7 +524,7 @@ Return your trading decision as JSON:"""
                 raise ValueError("No JSON object found in response")
             
             json_str = combined[start:end].strip()
-            parsed = json.loads(json_str)
+            parsed = orjson.loads(json_str)
             
             # POST-AI VALIDATION: Check if AI's decision aligns with filters
             ai_side = parsed.get("side", "flat")
@@ -689,10 +693,9 @@ Return JSON only: {{"side": "long", "pattern": "falling wedge", "reason": "break
             }
             
             print(f"🔍 Venice API call starting... (timeout: 20s)")
-            with httpx.Client(timeout=20) as client:
-                resp = client.post(self.venice_endpoint, headers=headers, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = self._http.post(self.venice_endpoint, headers=headers, content=orjson.dumps(payload), timeout=20)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
             print(f"✅ Venice API responded")
             text = None
             if isinstance(data, dict) and "choices" in data:
@@ -705,13 +708,12 @@ Return JSON only: {{"side": "long", "pattern": "falling wedge", "reason": "break
             if not text:
                 return None
             # Try to parse JSON object
-            import json as _json
             decision_obj = None
             try:
                 start = text.find("{")
                 end = text.rfind("}") + 1
                 if start != -1 and end > start:
-                    decision_obj = _json.loads(text[start:end])
+                    decision_obj = orjson.loads(text[start:end])
             except Exception:
                 decision_obj = None
             if not decision_obj:
@@ -0,0 +1,140 @@
+"""
+Candle Cache - Rolling window of candles kept between live-loop ticks
+
+The live loop used to download the full candle window (hundreds of bars)
+on every tick even though only the newest one or two bars change. The
+cache keeps the window in a fixed numpy ring buffer (one float64 row of
+ts/open/high/low/close/volume per bar) and merges in just the bars fetched
+since the last one it holds. The list-of-dicts view the analysis modules
+take is rebuilt only for the bars that changed since the last snapshot.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Column indexes into the ring buffer rows
+TS, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+class CandleCache:
+    """Bounded, timestamp-ordered window of OHLCV candles."""
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: Number of candles to retain (oldest are dropped first)
+        """
+        self.limit = limit
+        self._bars = np.empty((limit, 6), dtype=np.float64)
+        # Total rows ever appended (never reset, so a bar's absolute index is
+        # unique); the next write goes to _head % limit
+        self._head = 0
+        self._len = 0
+        # Bumped on every write, so cached views know when to rebuild
+        self._version = 0
+        self._snapshot_version = -1
+        # Last snapshot's dicts, covering absolute rows [_snapshot_start, _snapshot_head)
+        self._snapshot: List[Dict[str, Any]] = []
+        self._snapshot_start = 0
+        self._snapshot_head = 0
+        # True until a full REST refresh has brought the window up to date,
+        # and again whenever a streaming feed may have missed bars
+        self.stale = True
+        # time.monotonic() of the last merge, to spot a feed that went quiet
+        self.updated_at = 0.0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _row(self, index: int) -> int:
+        """Ring-buffer row of the candle at window position `index`."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("candle index out of range")
+        return (self._head - self._len + index) % self.limit
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Single candle by position (e.g. cache[-1] for the newest)."""
+        ts, o, h, l, c, v = self._bars[self._row(index)].tolist()
+        return {"ts": int(ts), "open": o, "high": h, "low": l, "close": c, "volume": v}
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        """Open time (ms) of the newest cached candle, or None when empty."""
+        return int(self._bars[(self._head - 1) % self.limit, TS]) if self._len else None
+
+    def clear(self) -> None:
+        self._len = 0
+        self._version += 1
+        self.stale = True
+
+    def update(self, ohlcv: Sequence[Sequence[Any]]) -> None:
+        """
+        Merge raw ccxt OHLCV rows ([ts, open, high, low, close, volume]).
+
+        A row with the same timestamp as the newest cached candle replaces it
+        (that bar was still forming); newer rows are appended and older rows
+        are ignored.
+        """
+        bars = self._bars
+        limit = self.limit
+        last_ts = self.last_ts
+        for c in ohlcv:
+            ts = c[0]
+            if last_ts is not None and ts < last_ts:
+                continue
+            if ts != last_ts:
+                self._head += 1
+                if self._len < limit:
+                    self._len += 1
+                last_ts = ts
+            bars[(self._head - 1) % limit] = c[:6]
+        if ohlcv:
+            self._version += 1
+            self.updated_at = time.monotonic()
+
+    def array(self) -> np.ndarray:
+        """Current window as an (n, 6) float64 array, oldest first (a copy)."""
+        start = (self._head - self._len) % self.limit
+        return np.roll(self._bars, -start, axis=0)[:self._len]
+
+    def _dicts(self, first: int) -> List[Dict[str, Any]]:
+        """Candle dicts for absolute rows [first, _head)."""
+        bars = self._bars[np.arange(first, self._head) % self.limit]
+        # Unbox column by column (ts straight to int64) and zip the columns
+        # back into rows: about half the cost of unpacking per-row lists and
+        # calling int() on every timestamp
+        ts = bars[:, TS].astype(np.int64).tolist()
+        o, h, l, c, v = bars[:, OPEN:].T.tolist()
+        return [
+            {"ts": t, "open": op, "high": hi, "low": lo, "close": cl, "volume": vo}
+            for t, op, hi, lo, cl, vo in zip(ts, o, h, l, c, v)
+        ]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Current window as a list of candle dicts, oldest first.
+
+        Dicts from the previous snapshot are reused for bars that cannot
+        have changed since (everything older than the bar that was newest
+        then), so a new bar costs one or two dicts instead of the whole
+        window. Callers share the dicts and must not mutate them; the
+        returned list itself is a fresh copy.
+        """
+        if self._snapshot_version != self._version:
+            start = self._head - self._len
+            # The previous newest bar may have been updated in place since
+            reuse_end = self._snapshot_head - 1
+            if self._snapshot_start <= start < reuse_end:
+                offset = start - self._snapshot_start
+                self._snapshot = (self._snapshot[offset:reuse_end - self._snapshot_start]
+                                  + self._dicts(reuse_end))
+            else:
+                self._snapshot = self._dicts(start)
+            self._snapshot_start = start
+            self._snapshot_head = self._head
+            self._snapshot_version = self._version
+        return list(self._snapshot)
@@ -65,6 +65,7 @@ class Settings(BaseModel):
     stats_count_partials_as_wins: bool = Field(True, alias="STATS_COUNT_PARTIALS_AS_WINS")
     stats_basis: str = Field("net", alias="STATS_BASIS")  # "net" or "R"
     include_fees_in_stats: bool = Field(True, alias="INCLUDE_FEES_IN_STATS")
+    log_level: str = Field("INFO", alias="LOG_LEVEL")  # DEBUG shows position-sizing details
 
 
 def load_settings() -> Settings:
@@ -1,10 +1,16 @@
+import logging
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
 from eth_account import Account
+from requests.adapters import HTTPAdapter
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+logger = logging.getLogger(__name__)
+
 
 class HyperliquidClient:
     def __init__(
@@ -21,27 +27,98 @@ class HyperliquidClient:
         self.account_address = account_address or self.wallet.address
         base_url = base_url_override or (constants.TESTNET_API_URL if testnet else constants.MAINNET_API_URL)
         self.info = Info(base_url, skip_ws=skip_ws)
+        
+        # Order id -> [filled size, filled notional] summed over its fills on the
+        # userFills stream (bounded, newest last)
+        self._filled_oids: "OrderedDict[int, List[float]]" = OrderedDict()
+        self._fills_cond = threading.Condition()
+        self._fill_stream = not skip_ws
+        if self._fill_stream:
+            self.info.subscribe({"type": "userFills", "user": self.account_address}, self._on_user_fills)
         self.exchange = Exchange(self.wallet, base_url, account_address=self.account_address)
         
+        # Each SDK object opens its own requests.Session to the same host. Share
+        # one keep-alive pool (sized for the loop's concurrent reads) so queries
+        # and orders reuse warm TLS connections.
+        session = self.info.session
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        self.exchange.session = session
+        if getattr(self.exchange, "info", None) is not None:
+            self.exchange.info.session = session
+        
         # Note: Bot assumes 10x leverage - set this manually in Hyperliquid UI
         print("⚠️ IMPORTANT: Ensure your Hyperliquid account is set to 10x leverage (Cross Margin)")
 
+    def close(self) -> None:
+        """Stop the SDK's WebSocket (and its ping thread) if the fill stream is on."""
+        if self._fill_stream:
+            self._fill_stream = False
+            self.info.disconnect_websocket()
+
+    def _on_user_fills(self, msg: Dict[str, Any]) -> None:
+        """userFills WebSocket callback (runs on the SDK's socket thread)."""
+        data = msg.get("data") or {}
+        if data.get("isSnapshot"):
+            return
+        with self._fills_cond:
+            for fill in data.get("fills", []):
+                oid = fill.get("oid")
+                if oid is None:
+                    continue
+                sz = float(fill.get("sz") or 0)
+                totals = self._filled_oids.setdefault(oid, [0.0, 0.0])
+                totals[0] += sz
+                totals[1] += sz * float(fill.get("px") or 0)
+            while len(self._filled_oids) > 256:
+                self._filled_oids.popitem(last=False)
+            self._fills_cond.notify_all()
+
+    def wait_for_fill(self, order_result: Dict[str, Any], timeout: float = 2.0) -> Optional[Dict[str, float]]:
+        """Block until the order in `order_result` is filled, for at most `timeout` seconds.
+
+        Market orders usually come back already filled in the order response.
+        Otherwise the resting order id is awaited on the userFills stream
+        (only available when the client was created with skip_ws=False).
+        Returns {"size", "avg_px"} of what has filled so far, or None if no
+        fill was seen; callers then fall back to polling positions().
+        """
+        try:
+            status = order_result["response"]["data"]["statuses"][0]
+        except (KeyError, IndexError, TypeError):
+            return None
+        if not isinstance(status, dict):
+            return None
+        filled = status.get("filled")
+        if isinstance(filled, dict):
+            return {"size": float(filled.get("totalSz") or 0), "avg_px": float(filled.get("avgPx") or 0)}
+        oid = (status.get("resting") or {}).get("oid")
+        if oid is None or not self._fill_stream:
+            return None
+        with self._fills_cond:
+            if not self._fills_cond.wait_for(lambda: oid in self._filled_oids, timeout):
+                return None
+            size, notional = self._filled_oids[oid]
+        return {"size": size, "avg_px": notional / size if size else 0.0}
+
     def account(self) -> Dict[str, Any]:
         """Get account state with equity"""
-        print(f"🔍 Querying account: {self.account_address} (via API wallet: {self.wallet.address})")
+        # Raw API dumps go through lazy %-formatting: skipped unless DEBUG is on
+        logger.debug("🔍 Querying account: %s (via API wallet: %s)", self.account_address, self.wallet.address)
         state = self.info.user_state(self.account_address)
-        print(f"🔍 Raw marginSummary: {state.get('marginSummary', {})}")
+        logger.debug("🔍 Raw marginSummary: %s", state.get("marginSummary", {}))
         summary = state.get("marginSummary", {})
         equity = float(summary.get("accountValue", 0))
         print(f"✅ Hyperliquid connected: ${equity:.2f} USDC")
         return {"equity": equity, "raw_state": state}
 
-    def positions(self) -> List[Dict[str, Any]]:
-        state = self.account().get("raw_state", {})
+    def positions(self, raw_state: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Open positions, parsed from `raw_state` (account()["raw_state"]) when
+        given so a caller that just read the account doesn't query it twice."""
+        state = raw_state if raw_state is not None else self.account().get("raw_state", {})
         positions = []
         asset_positions = state.get("assetPositions", [])
         
-        print(f"🔍 Raw assetPositions count: {len(asset_positions)}")
+        logger.debug("🔍 Raw assetPositions count: %d", len(asset_positions))
         
         for p in asset_positions:
             pos = p.get("position") or {}
@@ -64,7 +141,7 @@ class HyperliquidClient:
                 "leverage": float(pos.get("leverage", {}).get("value", 0)) if isinstance(pos.get("leverage"), dict) else 0,
             }
             
-            print(f"✅ Found position: {position_data}")
+            logger.debug("✅ Found position: %s", position_data)
             positions.append(position_data)
         
         if not positions:
@@ -89,6 +166,48 @@ class HyperliquidClient:
         print(f"📊 Order result: {result}")
         return result
 
+    @staticmethod
+    def _trigger_request(symbol: str, side: str, size: float, trigger_price: float,
+                         is_stop: bool, reduce_only: bool = True) -> Dict[str, Any]:
+        """SDK order request for a market trigger (stop loss / take profit) order."""
+        # Convert to proper types
+        price_float = round(float(trigger_price), 2)
+        return {
+            "coin": symbol,
+            "is_buy": side.lower() == "buy",
+            "sz": round(float(size), 4),
+            "limit_px": price_float,
+            # Hyperliquid trigger order structure - triggerPx must be string
+            "order_type": {"trigger": {"triggerPx": f"{price_float:.2f}", "isMarket": True, "tpsl": "sl" if is_stop else "tp"}},
+            "reduce_only": reduce_only,
+        }
+
+    def place_tpsl_orders(self, symbol: str, side: str, size: float,
+                          stop_price: Optional[float] = None, tp_price: Optional[float] = None) -> Dict[str, Any]:
+        """Place the stop loss and take profit (either may be None) as one signed
+        bulk order, so the position is protected after a single round trip.
+
+        Sending them as two concurrent orders instead would race the SDK's
+        millisecond-timestamp nonces, which the exchange rejects when reused.
+        """
+        orders = []
+        if stop_price is not None:
+            orders.append(self._trigger_request(symbol, side, size, stop_price, is_stop=True))
+        if tp_price is not None:
+            orders.append(self._trigger_request(symbol, side, size, tp_price, is_stop=False))
+        if not orders:
+            return {"status": "noop"}
+        
+        try:
+            result = self.exchange.bulk_orders(orders)
+            print(f"✅ Trigger orders placed: {result}")
+            return result
+        except Exception as e:
+            print(f"❌ Failed to place trigger orders: {e}")
+            import traceback
+            traceback.print_exc()
+            return {"status": "error", "error": str(e)}
+
     def place_trigger_order(self, symbol: str, side: str, size: float, trigger_price: float, is_stop: bool = True, reduce_only: bool = True) -> Dict[str, Any]:
         """Place stop loss or take profit trigger order
         
@@ -100,23 +219,16 @@ class HyperliquidClient:
             is_stop: True for stop loss, False for take profit
             reduce_only: True to only close positions, not open new ones
         """
-        is_buy = side.lower() == "buy"
-        # Convert to proper types
-        size_float = round(float(size), 4)
-        price_float = round(float(trigger_price), 2)
-        
-        # Hyperliquid trigger order structure - triggerPx must be string
-        order_type = {"trigger": {"triggerPx": f"{price_float:.2f}", "isMarket": True, "tpsl": "tp" if not is_stop else "sl"}}
-        
-        print(f"🎯 Placing {'Stop Loss' if is_stop else 'Take Profit'}: {side.upper()} {size_float} {symbol} @ ${price_float}")
+        req = self._trigger_request(symbol, side, size, trigger_price, is_stop, reduce_only)
+        print(f"🎯 Placing {'Stop Loss' if is_stop else 'Take Profit'}: {side.upper()} {req['sz']} {symbol} @ ${req['limit_px']}")
         
         try:
             result = self.exchange.order(
                 symbol,
-                is_buy=is_buy,
-                sz=size_float,
-                limit_px=price_float,
-                order_type=order_type,
+                is_buy=req["is_buy"],
+                sz=req["sz"],
+                limit_px=req["limit_px"],
+                order_type=req["order_type"],
                 reduce_only=reduce_only
             )
             print(f"✅ Trigger order placed: {result}")
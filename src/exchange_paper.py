@@ -1,6 +1,7 @@
 import json
 import os
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 
 class PaperExchange:
@@ -29,7 +30,9 @@ class PaperExchange:
             self.position = {"coin": None, "size": 0.0, "entry": 0.0, "margin": 0.0}
             print(f"Paper wallet initialized: ${self.equity:.2f}, leverage={self.leverage}x (file not found: {self.state_file})")
             
-        self.trades: List[Dict[str, Any]] = []
+        # In-memory fill log only (PnL history lives in PnLTracker); bounded so a
+        # long-running paper session doesn't grow without limit
+        self.trades: Deque[Dict[str, Any]] = deque(maxlen=1024)
         self._save_state()
     
     def _save_state(self):
@@ -64,6 +67,15 @@ class PaperExchange:
         print(f"📈 Position: {abs(signed_size):.4f} ETH (${margin_required:.2f}), Leveraged {self.leverage}x = {leveraged_size:.4f} ETH")
         return {"status": "filled", "paper": True, "price": price, "size": leveraged_size, "side": side}
 
+    def close(self) -> None:
+        """Nothing to release; mirrors HyperliquidClient.close()."""
+
+    def wait_for_fill(self, order_result: Dict[str, Any], timeout: float = 2.0) -> Optional[Dict[str, float]]:
+        """Paper orders fill inside place_market(); report the resulting position."""
+        if order_result.get("status") != "filled" or self.position["size"] == 0:
+            return None
+        return {"size": abs(self.position["size"]), "avg_px": self.position["entry"]}
+
     def close_position(self, symbol: str, size: float = None, max_slippage_pct: float = 0.5, price: float = None) -> Dict[str, Any]:
         if price is None:
             raise RuntimeError("Paper mode requires price input")
@@ -6,10 +6,14 @@ within the same trading session. Looks for unusual shapes like staircases,
 mountains, words, or any non-standard pattern that appears fractally.
 """
 
+import time
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
 
+from .indicators import candles_to_array, candle_timestamps, CLOSE
+
 
 class NestedFractalBrain:
     """
@@ -25,14 +29,41 @@ class NestedFractalBrain:
         """
         self.min_similarity = min_similarity
         self.scale_ratio_min = scale_ratio_min
+        
+        # Last analysis, reused while the candle window is unchanged
+        self._cache_key = None
+        self._cache_result = None
     
-    def analyze(self, candles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def analyze(self, candles: List[Dict[str, Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Analyze candles for nested fractal patterns.
         
+        The pattern search is expensive and the live loop polls more often
+        than the analyzed timeframe closes, so the result is cached until the
+        window moves or the last candle's close changes.
+        
+        Args:
+            candles: Candle data
+            timeout: Seconds the pattern search may take; raises TimeoutError
+                (checked between batches, so it works on any thread)
+        
         Returns:
             Dict with fractal analysis results
         """
+        key = None
+        if candles and candles[0].get('ts') is not None and candles[-1].get('ts') is not None:
+            key = (len(candles), candles[0]['ts'], candles[-1]['ts'], candles[-1]['close'])
+        if key is not None and key == self._cache_key:
+            return self._cache_result
+        
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        result = self._analyze(candles, deadline)
+        self._cache_key = key
+        self._cache_result = result
+        return result
+    
+    def _analyze(self, candles: List[Dict[str, Any]], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Uncached analysis behind analyze()."""
         if len(candles) < 30:
             return {
                 "fractals_found": False,
@@ -40,15 +71,15 @@ class NestedFractalBrain:
                 "patterns": []
             }
         
-        # Extract price data
-        prices = [float(c['close']) for c in candles]
-        times = [c.get('ts', c.get('time', 0)) for c in candles]
+        # Extract price data (converted to float64 once, at ingest)
+        prices = candles_to_array(candles)[:, CLOSE]
+        times = candle_timestamps(candles).tolist()
         
         # Normalize prices for pattern matching
         prices_norm = self._normalize(prices)
         
         # Find nested fractals at different scales
-        fractals = self._find_nested_patterns(prices_norm, times)
+        fractals = self._find_nested_patterns(prices_norm, times, deadline)
         
         if not fractals:
             return {
@@ -73,7 +104,8 @@ class NestedFractalBrain:
             return np.zeros_like(arr)
         return (arr - min_val) / (max_val - min_val)
     
-    def _find_nested_patterns(self, prices: np.ndarray, times: List[int]) -> List[Dict[str, Any]]:
+    def _find_nested_patterns(self, prices: np.ndarray, times: List[int],
+                              deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Find patterns that repeat at different scales.
         
@@ -81,87 +113,125 @@ class NestedFractalBrain:
         1. Scan for small patterns (5-15 candles)
         2. Look for larger versions (15-40 candles) of the same shape
         3. Calculate similarity using correlation
+        
+        Each (small size, large size) pair is scored in one batch: all small
+        windows are correlated against all resampled large windows with a
+        single matrix product, instead of resampling and correlating one
+        window pair at a time.
+        
+        Raises TimeoutError once time.monotonic() passes `deadline`.
         """
         fractals = []
         n = len(prices)
         
+        # Per-candle start labels, formatted once rather than per match
+        start_times = [datetime.fromtimestamp(ts / 1000).strftime("%H:%M") for ts in times]
+        
         # Search for small patterns (5-15 candles)
         for small_size in range(5, 16):
-            for small_start in range(n - small_size):
-                small_pattern = prices[small_start:small_start + small_size]
-                small_pattern_norm = self._normalize(small_pattern)
+            n_small = n - small_size
+            if n_small <= 0:
+                continue
+            small_starts = np.arange(n_small)
+            small_norm = self._normalize_rows(sliding_window_view(prices, small_size)[:n_small])
+            small_centered, small_ss = self._center_rows(small_norm)
+            
+            # Search for larger patterns (at least 2x the size)
+            min_large_size = int(small_size * self.scale_ratio_min)
+            hits = []
+            
+            for large_size in range(min_large_size, min(40, n)):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError("Fractal brain analysis timed out")
+                n_large = n - large_size
+                large_starts = np.arange(n_large)
+                
+                # Resample large patterns to match small pattern size
+                large = sliding_window_view(prices, large_size)[:n_large]
+                large_norm = self._normalize_rows(self._resample_rows(large, small_size))
+                large_centered, large_ss = self._center_rows(large_norm)
+                
+                # Calculate similarity (absolute Pearson correlation, patterns can
+                # be inverted; flat patterns have no defined correlation)
+                denom = np.sqrt(np.outer(small_ss, large_ss))
+                dots = np.abs(small_centered @ large_centered.T)
+                similarity = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+                np.minimum(similarity, 1.0, out=similarity)
                 
-                # Search for larger patterns (at least 2x the size)
-                min_large_size = int(small_size * self.scale_ratio_min)
-                max_large_size = min(40, n - small_start)
+                match = similarity >= self.min_similarity
+                # Large pattern must fit after the small start (max large size is n - small_start)
+                match &= (small_starts < n_large)[:, None]
+                # Don't overlap
+                match &= ~(
+                    (large_starts[None, :] + large_size > small_starts[:, None]) &
+                    (large_starts[None, :] < small_starts[:, None] + small_size)
+                )
                 
-                for large_size in range(min_large_size, max_large_size):
-                    for large_start in range(n - large_size):
-                        # Don't overlap
-                        if large_start + large_size > small_start and large_start < small_start + small_size:
-                            continue
-                        
-                        large_pattern = prices[large_start:large_start + large_size]
-                        
-                        # Resample large pattern to match small pattern size
-                        large_pattern_resampled = self._resample(large_pattern, small_size)
-                        large_pattern_norm = self._normalize(large_pattern_resampled)
-                        
-                        # Calculate similarity
-                        similarity = self._calculate_similarity(small_pattern_norm, large_pattern_norm)
-                        
-                        if similarity >= self.min_similarity:
-                            # Describe the pattern shape
-                            pattern_shape = self._describe_pattern(small_pattern_norm)
-                            
-                            fractal = {
-                                "type": "nested_fractal",
-                                "shape": pattern_shape,
-                                "similarity": float(similarity),
-                                "scale_ratio": large_size / small_size,
-                                "small_pattern": {
-                                    "start_idx": small_start,
-                                    "end_idx": small_start + small_size,
-                                    "size": small_size,
-                                    "start_time": datetime.fromtimestamp(times[small_start] / 1000).strftime("%H:%M")
-                                },
-                                "large_pattern": {
-                                    "start_idx": large_start,
-                                    "end_idx": large_start + large_size,
-                                    "size": large_size,
-                                    "start_time": datetime.fromtimestamp(times[large_start] / 1000).strftime("%H:%M")
-                                }
-                            }
-                            fractals.append(fractal)
+                for small_start, large_start in zip(*np.nonzero(match)):
+                    hits.append((int(small_start), large_size, int(large_start), float(similarity[small_start, large_start])))
+            
+            # Same order as a nested small_start / large_size / large_start scan
+            hits.sort()
+            shapes = {}
+            for small_start, large_size, large_start, similarity in hits:
+                # Describe the pattern shape (once per small window)
+                pattern_shape = shapes.get(small_start)
+                if pattern_shape is None:
+                    pattern_shape = shapes[small_start] = self._describe_pattern(small_norm[small_start])
+                
+                fractal = {
+                    "type": "nested_fractal",
+                    "shape": pattern_shape,
+                    "similarity": similarity,
+                    "scale_ratio": large_size / small_size,
+                    "small_pattern": {
+                        "start_idx": small_start,
+                        "end_idx": small_start + small_size,
+                        "size": small_size,
+                        "start_time": start_times[small_start]
+                    },
+                    "large_pattern": {
+                        "start_idx": large_start,
+                        "end_idx": large_start + large_size,
+                        "size": large_size,
+                        "start_time": start_times[large_start]
+                    }
+                }
+                fractals.append(fractal)
         
         # Remove duplicate/overlapping patterns, keep best matches
         fractals = self._deduplicate_fractals(fractals)
         
         return fractals[:5]  # Return top 5 fractals
     
-    def _resample(self, data: np.ndarray, target_size: int) -> np.ndarray:
-        """Resample data to target size using linear interpolation"""
-        if len(data) == target_size:
-            return data
-        
-        x_old = np.linspace(0, 1, len(data))
+    def _normalize_rows(self, windows: np.ndarray) -> np.ndarray:
+        """Normalize each row to 0-1 range (flat rows become zeros)"""
+        min_val = windows.min(axis=1, keepdims=True)
+        span = windows.max(axis=1, keepdims=True) - min_val
+        return np.divide(windows - min_val, span, out=np.zeros(windows.shape), where=span > 0)
+    
+    def _resample_rows(self, windows: np.ndarray, target_size: int) -> np.ndarray:
+        """Resample each row to target size using linear interpolation (as np.interp)"""
+        size = windows.shape[1]
+        x_old = np.linspace(0, 1, size)
         x_new = np.linspace(0, 1, target_size)
-        return np.interp(x_new, x_old, data)
+        j = np.clip(np.searchsorted(x_old, x_new, side="right") - 1, 0, size - 2)
+        slope = (windows[:, j + 1] - windows[:, j]) / (x_old[j + 1] - x_old[j])
+        out = slope * (x_new - x_old[j]) + windows[:, j]
+        # np.interp returns the endpoint exactly
+        out[:, -1] = windows[:, -1]
+        return out
     
-    def _calculate_similarity(self, pattern1: np.ndarray, pattern2: np.ndarray) -> float:
-        """Calculate similarity between two patterns using correlation"""
-        if len(pattern1) != len(pattern2):
-            return 0.0
-        
-        # Pearson correlation coefficient
-        corr = np.corrcoef(pattern1, pattern2)[0, 1]
-        
-        # Handle NaN (happens if one pattern is flat)
-        if np.isnan(corr):
-            return 0.0
+    def _center_rows(self, windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Subtract each row's mean; also return each row's sum of squares.
         
-        # Return absolute correlation (patterns can be inverted)
-        return abs(corr)
+        The centered rows only feed the correlation products, so they are
+        stored as float32: rows are 0-1 normalized shapes, where single
+        precision is ample, and the matrix products move half the bytes.
+        """
+        centered = (windows - windows.mean(axis=1, keepdims=True)).astype(np.float32)
+        return centered, np.einsum("ij,ij->i", centered, centered)
     
     def _describe_pattern(self, pattern: np.ndarray) -> str:
         """
@@ -198,19 +268,13 @@ class NestedFractalBrain:
     
     def _count_peaks(self, data: np.ndarray, threshold: float = 0.1) -> int:
         """Count local maxima"""
-        peaks = 0
-        for i in range(1, len(data) - 1):
-            if data[i] > data[i-1] + threshold and data[i] > data[i+1] + threshold:
-                peaks += 1
-        return peaks
+        mid = data[1:-1]
+        return int(np.count_nonzero((mid > data[:-2] + threshold) & (mid > data[2:] + threshold)))
     
     def _count_valleys(self, data: np.ndarray, threshold: float = 0.1) -> int:
         """Count local minima"""
-        valleys = 0
-        for i in range(1, len(data) - 1):
-            if data[i] < data[i-1] - threshold and data[i] < data[i+1] - threshold:
-                valleys += 1
-        return valleys
+        mid = data[1:-1]
+        return int(np.count_nonzero((mid < data[:-2] - threshold) & (mid < data[2:] - threshold)))
     
     def _deduplicate_fractals(self, fractals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove overlapping fractals, keep highest similarity"""
@@ -254,7 +318,7 @@ class NestedFractalBrain:
         
         return small_overlap or large_overlap
     
-    def _generate_signal(self, fractals: List[Dict[str, Any]], prices: List[float]) -> str:
+    def _generate_signal(self, fractals: List[Dict[str, Any]], prices: np.ndarray) -> str:
         """
         Generate trading signal based on fractal patterns.
         
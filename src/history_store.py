@@ -1,8 +1,9 @@
-import json
 import os
 import time
 from typing import Dict, List
 
+import orjson
+
 
 class HistoryStore:
     def __init__(self, path: str = "data/claude_history.jsonl", max_hours: int = 24, carry_hours: int = 3):
@@ -15,21 +16,21 @@ class HistoryStore:
         entries: List[Dict] = []
         if not os.path.exists(self.path):
             return entries
-        with open(self.path, "r", encoding="utf-8") as fh:
+        with open(self.path, "rb") as fh:
             for line in fh:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
+                    entries.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
                     continue
         return entries
 
     def _write_entries(self, entries: List[Dict]) -> None:
-        with open(self.path, "w", encoding="utf-8") as fh:
+        with open(self.path, "wb") as fh:
             for entry in entries:
-                fh.write(json.dumps(entry) + "\n")
+                fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
 
     def rollover_if_needed(self) -> None:
         entries = self._read_entries()
@@ -43,9 +44,9 @@ class HistoryStore:
         carried = [e for e in entries if e.get("ts", 0) >= cutoff]
         archive_path = f"{self.path}.archive"
         try:
-            with open(archive_path, "a", encoding="utf-8") as fh:
+            with open(archive_path, "ab") as fh:
                 for entry in entries:
-                    fh.write(json.dumps(entry) + "\n")
+                    fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
         except OSError:
             pass
         self._write_entries(carried)
@@ -58,8 +59,8 @@ class HistoryStore:
     def record_decision(self, decision: Dict) -> None:
         self.rollover_if_needed()
         entry = {"ts": time.time(), "decision": decision}
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(entry) + "\n")
+        with open(self.path, "ab") as fh:
+            fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
     
     def clear_history(self) -> None:
         """Clear all decision history. Called when a trade is closed to ensure fresh start."""
@@ -69,9 +70,9 @@ class HistoryStore:
             entries = self._read_entries()
             if entries:
                 try:
-                    with open(archive_path, "a", encoding="utf-8") as fh:
+                    with open(archive_path, "ab") as fh:
                         for entry in entries:
-                            fh.write(json.dumps(entry) + "\n")
+                            fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
                 except OSError:
                     pass
         # Clear current history file
@@ -0,0 +1,79 @@
+"""
+Indicators - Shared candle parsing and numeric kernels
+
+Analysis modules receive candles as lists of dicts. Parsing them into one
+contiguous OHLC array up front lets every indicator work on column views
+instead of walking the dicts again.
+"""
+
+from typing import Any, Dict, List
+import numpy as np
+
+
+# Column indexes into the (n, 4) array returned by candles_to_array
+OPEN, HIGH, LOW, CLOSE = 0, 1, 2, 3
+
+
+def candles_to_array(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Parse candle dicts into a float64 array of shape (n, 4).
+
+    Columns are open/high/low/close (see OPEN, HIGH, LOW, CLOSE).
+    Values may be numbers or numeric strings.
+    """
+    if not candles:
+        return np.empty((0, 4), dtype=np.float64)
+    return np.array(
+        [(c['open'], c['high'], c['low'], c['close']) for c in candles],
+        dtype=np.float64
+    )
+
+
+def candle_timestamps(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Candle timestamps (ms) as an int64 array.
+
+    The key style ('ts' or 'time') is detected once on the first candle
+    instead of chaining dict.get fallbacks per candle. Candles with neither
+    key yield zeros.
+    """
+    if not candles:
+        return np.empty(0, dtype=np.int64)
+    first = candles[0]
+    key = 'ts' if 'ts' in first else 'time' if 'time' in first else None
+    if key is None:
+        return np.zeros(len(candles), dtype=np.int64)
+    return np.array([c[key] for c in candles], dtype=np.int64)
+
+
+def true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """
+    True Range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+    Single-pass ufuncs, no boolean masks. The first candle has no previous
+    close, so its TR is just high - low.
+    """
+    tr = highs - lows
+    if len(tr) > 1:
+        prev_close = closes[:-1]
+        np.maximum(tr[1:], np.abs(highs[1:] - prev_close), out=tr[1:])
+        np.maximum(tr[1:], np.abs(lows[1:] - prev_close), out=tr[1:])
+    return tr
+
+
+def ema_recurrence(values: np.ndarray, alpha: float, seed: float, start: int) -> np.ndarray:
+    """
+    EMA recurrence: out[start-1] = seed, out[i] = alpha*values[i] + (1-alpha)*out[i-1].
+
+    Entries before start-1 are left at 0. Runs over plain Python floats:
+    indexing numpy scalars element by element is several times slower than
+    iterating a list.
+    """
+    out = [0.0] * len(values)
+    prev = seed
+    out[start - 1] = prev
+    keep = 1 - alpha
+    for i, v in enumerate(values[start:].tolist(), start=start):
+        prev = alpha * v + keep * prev
+        out[i] = prev
+    return np.array(out)
@@ -9,9 +9,12 @@ Implements:
 - Session context (high/low/range boundaries)
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime, time as dt_time
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicators import candles_to_array, ema_recurrence, true_range, HIGH, LOW, CLOSE
 
 
 class MarketStructure:
@@ -26,6 +29,7 @@ class MarketStructure:
         self.atr_period = atr_period
         self.atr_compression_threshold = atr_compression_threshold
         self.structure_lookback = structure_lookback
+        self._atr_alpha = 2 / (atr_period + 1)
     
     def analyze(
         self,
@@ -49,10 +53,11 @@ class MarketStructure:
                 "bias": "neutral"
             }
         
-        # Extract 5m data
-        closes_5m = np.array([float(c['close']) for c in candles_5m])
-        highs_5m = np.array([float(c['high']) for c in candles_5m])
-        lows_5m = np.array([float(c['low']) for c in candles_5m])
+        # Parse 5m candles once; every check below reads views of this array
+        ohlc_5m = candles_to_array(candles_5m)
+        closes_5m = ohlc_5m[:, CLOSE]
+        highs_5m = ohlc_5m[:, HIGH]
+        lows_5m = ohlc_5m[:, LOW]
         
         # Calculate ATR on 5m
         atr_current, atr_avg, atr_ratio = self._calculate_atr_metrics(highs_5m, lows_5m, closes_5m)
@@ -65,14 +70,14 @@ class MarketStructure:
             bias = self._detect_bias(candles_15m)
             bias_timeframe = "15m"
         else:
-            bias = self._detect_bias(candles_5m)
+            bias = self._detect_bias(ohlc_5m)
             bias_timeframe = "5m"
         
         # Time-of-day filter
         time_allowed, time_reason = self._check_time_filter(candles_5m[-1])
         
         # Session context
-        session_context = self._analyze_session_context(candles_5m)
+        session_context = self._analyze_session_context(ohlc_5m)
         
         # Determine if trading is allowed
         allowed = True
@@ -124,22 +129,15 @@ class MarketStructure:
         if len(closes) < 2:
             return 0.0, 0.0, 1.0
         
-        high_low = highs - lows
-        high_close = np.abs(highs[1:] - closes[:-1])
-        low_close = np.abs(lows[1:] - closes[:-1])
-        
-        # Pad first element
-        high_close = np.concatenate([[high_low[0]], high_close])
-        low_close = np.concatenate([[high_low[0]], low_close])
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
+        # Shared kernel: no padded copies of the prev-close gaps
+        tr = true_range(highs, lows, closes)
         
         # Calculate ATR using EMA
-        if len(true_range) < self.atr_period:
-            atr = np.mean(true_range)
-            atr_values = true_range
+        if len(tr) < self.atr_period:
+            atr = np.mean(tr)
+            atr_values = tr
         else:
-            atr_values = self._ema(true_range, self.atr_period)
+            atr_values = self._ema(tr, self.atr_period)
             atr = atr_values[-1]
         
         # Average ATR over recent period (last 50 candles or available)
@@ -153,19 +151,15 @@ class MarketStructure:
     
     def _ema(self, data: np.ndarray, period: int) -> np.ndarray:
         """Calculate Exponential Moving Average"""
-        alpha = 2 / (period + 1)
-        ema = np.zeros_like(data)
-        ema[0] = data[0]
-        
-        for i in range(1, len(data)):
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
-        
-        return ema
+        alpha = self._atr_alpha if period == self.atr_period else 2 / (period + 1)
+        return ema_recurrence(data, alpha, float(data[0]), 1)
     
-    def _detect_bias(self, candles: List[Dict[str, Any]]) -> str:
+    def _detect_bias(self, candles: Union[np.ndarray, List[Dict[str, Any]]]) -> str:
         """
         Detect market bias based on Higher Highs/Higher Lows vs Lower Highs/Lower Lows
         
+        Accepts an OHLC array from candles_to_array or raw candle dicts.
+        
         Returns:
             "bullish", "bearish", or "neutral"
         """
@@ -174,8 +168,10 @@ class MarketStructure:
         
         # Get recent highs and lows
         recent = candles[-self.structure_lookback:]
-        highs = [float(c['high']) for c in recent]
-        lows = [float(c['low']) for c in recent]
+        if not isinstance(recent, np.ndarray):
+            recent = candles_to_array(recent)
+        highs = recent[:, HIGH]
+        lows = recent[:, LOW]
         
         # Find swing points (local maxima and minima)
         swing_highs = self._find_swing_points(highs, is_high=True)
@@ -184,13 +180,17 @@ class MarketStructure:
         if len(swing_highs) < 2 or len(swing_lows) < 2:
             return "neutral"
         
+        # Step-to-step change between consecutive swings
+        high_steps = np.diff(swing_highs)
+        low_steps = np.diff(swing_lows)
+        
         # Check for Higher Highs and Higher Lows (bullish)
-        hh_count = sum(1 for i in range(1, len(swing_highs)) if swing_highs[i] > swing_highs[i-1])
-        hl_count = sum(1 for i in range(1, len(swing_lows)) if swing_lows[i] > swing_lows[i-1])
+        hh_count = int(np.count_nonzero(high_steps > 0))
+        hl_count = int(np.count_nonzero(low_steps > 0))
         
         # Check for Lower Highs and Lower Lows (bearish)
-        lh_count = sum(1 for i in range(1, len(swing_highs)) if swing_highs[i] < swing_highs[i-1])
-        ll_count = sum(1 for i in range(1, len(swing_lows)) if swing_lows[i] < swing_lows[i-1])
+        lh_count = int(np.count_nonzero(high_steps < 0))
+        ll_count = int(np.count_nonzero(low_steps < 0))
         
         # Determine bias
         bullish_score = hh_count + hl_count
@@ -204,24 +204,23 @@ class MarketStructure:
         else:
             return "neutral"
     
-    def _find_swing_points(self, data: List[float], is_high: bool = True) -> List[float]:
+    def _find_swing_points(self, data: np.ndarray, is_high: bool = True) -> np.ndarray:
         """Find swing highs or swing lows in price data"""
-        swing_points = []
         window = 3  # Look 3 candles back and forward
+        data = np.asarray(data, dtype=np.float64)
+        if len(data) < 2 * window + 1:
+            return np.empty(0)
+        
+        # A swing point is the extreme of the 7-candle window centred on it.
+        # One rolling reduction over strided views covers every position.
+        windows = sliding_window_view(data, 2 * window + 1)
+        centers = data[window:-window]
+        if is_high:
+            mask = centers >= windows.max(axis=1)
+        else:
+            mask = centers <= windows.min(axis=1)
         
-        for i in range(window, len(data) - window):
-            if is_high:
-                # Check if this is a local maximum
-                if all(data[i] >= data[i-j] for j in range(1, window+1)) and \
-                   all(data[i] >= data[i+j] for j in range(1, window+1)):
-                    swing_points.append(data[i])
-            else:
-                # Check if this is a local minimum
-                if all(data[i] <= data[i-j] for j in range(1, window+1)) and \
-                   all(data[i] <= data[i+j] for j in range(1, window+1)):
-                    swing_points.append(data[i])
-        
-        return swing_points
+        return centers[mask]
     
     def _check_time_filter(self, latest_candle: Dict[str, Any]) -> Tuple[bool, str]:
         """
@@ -258,23 +257,19 @@ class MarketStructure:
         
         return True, "Time filter passed"
     
-    def _analyze_session_context(self, candles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_session_context(self, ohlc: np.ndarray) -> Dict[str, Any]:
         """
         Analyze session-level context: highs, lows, range boundaries
         
         Uses last 78 candles (~6.5 hours on 5m chart) to define session
         """
-        session_size = min(78, len(candles))
-        session_candles = candles[-session_size:]
-        
-        highs = [float(c['high']) for c in session_candles]
-        lows = [float(c['low']) for c in session_candles]
-        closes = [float(c['close']) for c in session_candles]
+        session = ohlc[-78:]
         
-        session_high = max(highs)
-        session_low = min(lows)
+        # Pull scalars out as Python floats once; the math below is all scalar
+        session_high = float(session[:, HIGH].max())
+        session_low = float(session[:, LOW].min())
         session_range = session_high - session_low
-        current_price = closes[-1]
+        current_price = float(session[-1, CLOSE])
         
         # Determine position in range
         if session_range > 0:
@@ -291,11 +286,11 @@ class MarketStructure:
             position_label = "mid_range"
         
         return {
-            "high": float(session_high),
-            "low": float(session_low),
-            "range": float(session_range),
-            "range_pct": float(session_range / session_low * 100) if session_low > 0 else 0,
-            "current_position": float(range_position),
+            "high": session_high,
+            "low": session_low,
+            "range": session_range,
+            "range_pct": session_range / session_low * 100 if session_low > 0 else 0,
+            "current_position": range_position,
             "position_label": position_label,
         }
     
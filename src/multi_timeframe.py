@@ -11,9 +11,11 @@ Rules:
 - Mixed / flat → NO TRADES
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 
+from .indicators import candles_to_array, candle_timestamps, true_range, HIGH, LOW, CLOSE
+
 
 class MultiTimeframeAnalyzer:
     """
@@ -34,6 +36,10 @@ class MultiTimeframeAnalyzer:
         """
         self.bias_lookback = bias_lookback
         self.swing_sensitivity = swing_sensitivity
+        
+        # Last bias result, reused while the 15m window is unchanged
+        self._bias_key = None
+        self._bias_result = None
     
     def analyze_bias(
         self,
@@ -42,6 +48,9 @@ class MultiTimeframeAnalyzer:
         """
         Analyze 15-minute timeframe to determine bias.
         
+        A 15m bar spans several 5m ticks, so the result is cached and reused
+        until the window moves or the forming bar's high/low/close change.
+        
         Returns:
             Dict with:
                 - bias: str (bullish/bearish/neutral)
@@ -51,6 +60,22 @@ class MultiTimeframeAnalyzer:
                 - last_swing_low: float
                 - reason: str
         """
+        key = None
+        if len(candles_15m) >= self.bias_lookback:
+            first = candles_15m[-self.bias_lookback]
+            last = candles_15m[-1]
+            if first.get('ts') is not None and last.get('ts') is not None:
+                key = (first['ts'], last['ts'], last['high'], last['low'], last['close'])
+        if key is not None and key == self._bias_key:
+            return self._bias_result
+        
+        result = self._compute_bias(candles_15m)
+        self._bias_key = key
+        self._bias_result = result
+        return result
+    
+    def _compute_bias(self, candles_15m: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Uncached bias analysis behind analyze_bias()."""
         if len(candles_15m) < self.bias_lookback:
             return {
                 "bias": "neutral",
@@ -63,12 +88,14 @@ class MultiTimeframeAnalyzer:
         
         # Get recent candles for analysis
         recent = candles_15m[-self.bias_lookback:]
+        # Parsed once, shared by the ATR and swing passes
+        ohlc = candles_to_array(recent)
         
         # Calculate ATR for swing detection
-        atr = self._calculate_atr(recent, period=14)
+        atr = self._calculate_atr(ohlc, period=14)
         
         # Find swing highs and lows
-        swings = self._find_swings(recent, atr * self.swing_sensitivity)
+        swings = self._find_swings(recent, atr * self.swing_sensitivity, ohlc)
         
         if len(swings) < 2:
             return {
@@ -140,76 +167,92 @@ class MultiTimeframeAnalyzer:
             "confidence": confidence
         }
     
-    def _calculate_atr(self, candles: List[Dict[str, Any]], period: int = 14) -> float:
-        """Calculate Average True Range"""
+    def _calculate_atr(self, candles: Union[np.ndarray, List[Dict[str, Any]]], period: int = 14) -> float:
+        """Calculate Average True Range (from an OHLC array or raw candle dicts)"""
+        ohlc = candles if isinstance(candles, np.ndarray) else candles_to_array(candles)
+        highs = ohlc[:, HIGH]
+        lows = ohlc[:, LOW]
+        
         if len(candles) < period + 1:
             # Fallback: use simple range
-            highs = [float(c['high']) for c in candles]
-            lows = [float(c['low']) for c in candles]
-            return (max(highs) - min(lows)) / len(candles)
-        
-        highs = np.array([float(c['high']) for c in candles])
-        lows = np.array([float(c['low']) for c in candles])
-        closes = np.array([float(c['close']) for c in candles])
+            return (highs.max() - lows.min()) / len(candles)
         
-        # Calculate True Range
-        tr = np.zeros(len(candles))
-        tr[0] = highs[0] - lows[0]
-        
-        for i in range(1, len(candles)):
-            hl = highs[i] - lows[i]
-            hc = abs(highs[i] - closes[i-1])
-            lc = abs(lows[i] - closes[i-1])
-            tr[i] = max(hl, hc, lc)
+        # True Range of the last `period` candles (plus the close before them),
+        # via the shared np.maximum kernel
+        tail = ohlc[-period - 1:]
+        tr = true_range(tail[:, HIGH], tail[:, LOW], tail[:, CLOSE])[1:]
         
         # Return average of recent true ranges
-        return np.mean(tr[-period:])
+        return np.mean(tr)
     
     def _find_swings(
         self,
         candles: List[Dict[str, Any]],
-        min_move: float
+        min_move: float,
+        ohlc: Optional[np.ndarray] = None
     ) -> List[Dict[str, Any]]:
         """
         Find significant swing highs and lows.
         
+        Pass `ohlc` (candles_to_array of the same candles) to skip re-parsing.
+        
         Returns:
             List of swing points with type (high/low), price, and index
         """
         swings = []
+        n = len(candles)
+        if n < 5:
+            return swings
+        
+        if ohlc is None:
+            ohlc = candles_to_array(candles)
+        highs = ohlc[:, HIGH]
+        lows = ohlc[:, LOW]
+        
+        # Candidate pivots: strictly beyond the 2 candles before and after,
+        # evaluated for every index at once on shifted views
+        core_h = highs[2:n-2]
+        is_swing_high = ((core_h > highs[1:n-3]) & (core_h > highs[0:n-4]) &
+                         (core_h > highs[3:n-1]) & (core_h > highs[4:n]))
+        core_l = lows[2:n-2]
+        is_swing_low = ((core_l < lows[1:n-3]) & (core_l < lows[0:n-4]) &
+                        (core_l < lows[3:n-1]) & (core_l < lows[4:n]))
+        
+        candidates = np.flatnonzero(is_swing_high | is_swing_low)
+        if not len(candidates):
+            return swings
+        
+        times = candle_timestamps(candles).tolist()
+        high_list = highs.tolist()
+        low_list = lows.tolist()
+        swing_high_flags = is_swing_high.tolist()
+        swing_low_flags = is_swing_low.tolist()
         
-        for i in range(2, len(candles) - 2):
-            high = float(candles[i]['high'])
-            low = float(candles[i]['low'])
+        # The significance filter depends on the previous accepted swing, so
+        # walk the (few) candidates in order
+        for j in candidates.tolist():
+            i = j + 2
             
-            # Check for swing high (higher than 2 candles before and after)
-            if (high > float(candles[i-1]['high']) and
-                high > float(candles[i-2]['high']) and
-                high > float(candles[i+1]['high']) and
-                high > float(candles[i+2]['high'])):
-                
+            if swing_high_flags[j]:
+                high = high_list[i]
                 # Check if significant enough
                 if not swings or abs(high - swings[-1]['price']) >= min_move:
                     swings.append({
                         'type': 'high',
                         'price': high,
                         'index': i,
-                        'time': candles[i].get('ts', candles[i].get('time', 0))
+                        'time': times[i]
                     })
             
-            # Check for swing low (lower than 2 candles before and after)
-            if (low < float(candles[i-1]['low']) and
-                low < float(candles[i-2]['low']) and
-                low < float(candles[i+1]['low']) and
-                low < float(candles[i+2]['low'])):
-                
+            if swing_low_flags[j]:
+                low = low_list[i]
                 # Check if significant enough
                 if not swings or abs(low - swings[-1]['price']) >= min_move:
                     swings.append({
                         'type': 'low',
                         'price': low,
                         'index': i,
-                        'time': candles[i].get('ts', candles[i].get('time', 0))
+                        'time': times[i]
                     })
         
         return swings
@@ -1,8 +1,37 @@
+import bisect
 import json
 import os
 import time
 from typing import Dict, List
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+
+# Balance sheet layout, rendered with a single format_map/print per report
+BALANCE_HEADER_TEMPLATE = (
+    "\n" + "=" * 60 + "\n"
+    "📊 BALANCE SHEET & P&L REPORT\n"
+    + "=" * 60 + "\n"
+    "Starting Equity:    ${start_equity:,.2f}\n"
+    "Current Equity:     ${current_equity:,.2f}\n"
+)
+BALANCE_POSITION_TEMPLATE = (
+    "Open Position:      {side} {size:.4f} ETH @ ${entry:.2f}\n"
+    "Unrealized P&L:     ${unrealized_pnl:+,.2f}\n"
+)
+BALANCE_BODY_TEMPLATE = (
+    "Total Account Value: ${total_equity:,.2f}\n"
+    "Total P&L:          ${total_pnl:+,.2f} ({total_pnl_pct:+.2f}%)\n"
+    + "-" * 60 + "\n"
+    "Closed Trades:      {total_trades}\n"
+    "Winning Trades:     {winning_trades} ({win_rate:.1f}%)\n"
+    "Losing Trades:      {losing_trades}\n"
+    + "-" * 60 + "\n"
+    "Average Win:        ${avg_win:+,.2f}\n"
+    "Average Loss:       ${avg_loss:+,.2f}\n"
+    "Largest Win:        ${largest_win:+,.2f}\n"
+    "Largest Loss:       ${largest_loss:+,.2f}\n"
+    + "=" * 60 + "\n"
+)
 
 
 class PnLTracker:
@@ -12,6 +41,10 @@ class PnLTracker:
         self.path = path
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
         self.data = self._load(current_equity)
+        # Trades are appended in time order, so their timestamps stay sorted for bisect
+        self._ts_list = [t["ts"] for t in self.data["trades"]]
+        # (equity, position size, price, trade count) at the last balance sheet report
+        self._last_printed = None
     
     def _load(self, current_equity: float = None) -> Dict:
         if os.path.exists(self.path):
@@ -33,10 +66,11 @@ class PnLTracker:
         with open(self.path, "w", encoding="utf-8") as f:
             json.dump(self.data, f, indent=2)
     
-    def record_trade(self, trade_type: str, size: float, entry_price: float, exit_price: float = None, pnl: float = None):
+    def record_trade(self, trade_type: str, size: float, entry_price: float, exit_price: float = None, pnl: float = None,
+                     now: float = None):
         """Record a trade (open or close)"""
         trade = {
-            "ts": time.time(),
+            "ts": time.time() if now is None else now,
             "type": trade_type,  # "open" or "close"
             "size": size,
             "entry_price": entry_price,
@@ -44,12 +78,13 @@ class PnLTracker:
             "pnl": pnl
         }
         self.data["trades"].append(trade)
+        self._ts_list.append(trade["ts"])
         self._save()
     
-    def snapshot(self, equity: float, open_position: Dict = None):
+    def snapshot(self, equity: float, open_position: Dict = None, now: float = None):
         """Take equity snapshot"""
         snap = {
-            "ts": time.time(),
+            "ts": time.time() if now is None else now,
             "equity": equity,
             "open_position": open_position
         }
@@ -58,11 +93,28 @@ class PnLTracker:
     
     def get_stats(self, current_equity: float = None) -> Dict:
         """Calculate performance statistics"""
-        closed_trades = [t for t in self.data["trades"] if t.get("pnl") is not None]
-        winning = [t for t in closed_trades if t["pnl"] > 0]
-        losing = [t for t in closed_trades if t["pnl"] < 0]
+        # Single pass over trades: accumulate counts, sums and extremes together
+        closed = wins = losses = 0
+        total_pnl = win_sum = loss_sum = 0.0
+        largest_win = 0.0
+        largest_loss = 0.0
+        for t in self.data["trades"]:
+            p = t.get("pnl")
+            if p is None:
+                continue
+            closed += 1
+            total_pnl += p
+            if p > 0:
+                wins += 1
+                win_sum += p
+                if p > largest_win:
+                    largest_win = p
+            elif p < 0:
+                losses += 1
+                loss_sum += p
+                if p < largest_loss:
+                    largest_loss = p
         
-        total_pnl = sum(t["pnl"] for t in closed_trades)
         start_eq = self.data.get("start_equity", 10000)
         curr_eq = current_equity if current_equity is not None else start_eq + total_pnl
         
@@ -73,35 +125,35 @@ class PnLTracker:
             "total_pnl": total_pnl,
             "total_pnl_pct": (total_pnl / start_eq) * 100 if start_eq else 0,
             "pnl_pct": (total_pnl / start_eq) * 100 if start_eq else 0,  # Alias
-            "total_closed_trades": len(closed_trades),
-            "total_trades": len(closed_trades),  # Alias
-            "winning_trades": len(winning),
-            "losing_trades": len(losing),
-            "win_rate": (len(winning) / len(closed_trades) * 100) if closed_trades else 0,
-            "avg_win": (sum(t["pnl"] for t in winning) / len(winning)) if winning else 0,
-            "avg_loss": (sum(t["pnl"] for t in losing) / len(losing)) if losing else 0,
-            "largest_win": max((t["pnl"] for t in winning), default=0),
-            "largest_loss": min((t["pnl"] for t in losing), default=0),
+            "total_closed_trades": closed,
+            "total_trades": closed,  # Alias
+            "winning_trades": wins,
+            "losing_trades": losses,
+            "win_rate": (wins / closed * 100) if closed else 0,
+            "avg_win": (win_sum / wins) if wins else 0,
+            "avg_loss": (loss_sum / losses) if losses else 0,
+            "largest_win": largest_win,
+            "largest_loss": largest_loss,
         }
 
+    @staticmethod
+    def _period_start_ts(period: str) -> float:
+        """Epoch of the current daily/weekly/monthly period start (UTC midnight)."""
+        now = datetime.now(timezone.utc)
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if period == "weekly":
+            # ISO weeks start on Monday
+            start -= timedelta(days=start.weekday())
+        elif period == "monthly":
+            start = start.replace(day=1)
+        return start.timestamp()
+
     def _filter_period(self, period: str) -> List[Dict]:
         """Return trades closed in the given period (UTC boundaries)."""
-        now = datetime.now(timezone.utc)
-        trades = [t for t in self.data.get("trades", []) if t.get("pnl") is not None]
-        result = []
-        for t in trades:
-            dt = datetime.fromtimestamp(t["ts"], tz=timezone.utc)
-            include = False
-            if period == "daily":
-                include = (dt.date() == now.date())
-            elif period == "weekly":
-                # ISO week number
-                include = (dt.isocalendar()[:2] == now.isocalendar()[:2])
-            elif period == "monthly":
-                include = (dt.year == now.year and dt.month == now.month)
-            if include:
-                result.append(t)
-        return result
+        if period not in ("daily", "weekly", "monthly"):
+            return []
+        lo = bisect.bisect_left(self._ts_list, self._period_start_ts(period))
+        return [t for t in self.data["trades"][lo:] if t.get("pnl") is not None]
 
     def get_period_stats(self, period: str) -> Dict:
         """Daily/weekly/monthly stats using net PnL after fees if available."""
@@ -121,36 +173,50 @@ class PnLTracker:
             "avg_loss": (sum(t["pnl"] for t in losers) / len(losers)) if losers else 0,
         }
     
+    def balance_sheet_changed(self, current_equity: float, position: Dict = None, price: float = None,
+                              equity_tol: float = 0.0001, price_tol: float = 0.10) -> bool:
+        """
+        True when the balance sheet is worth reporting again: first call, a
+        trade was recorded, the position size changed, equity moved by more
+        than `equity_tol` (fraction) or price by more than `price_tol` dollars.
+        """
+        pos_size = position.get('size', 0) if position else 0
+        state = (current_equity, pos_size, price, len(self._ts_list))
+        last = self._last_printed
+        if last is not None:
+            last_equity, last_size, last_price, last_trades = last
+            unchanged = (
+                last_trades == state[3]
+                and last_size == pos_size
+                and abs(current_equity - last_equity) <= abs(last_equity) * equity_tol
+                and (price is None or last_price is None or abs(price - last_price) <= price_tol)
+            )
+            if unchanged:
+                return False
+        self._last_printed = state
+        return True
+    
     def print_balance_sheet(self, current_equity: float, unrealized_pnl: float = 0, position: Dict = None):
         """Print formatted balance sheet with unrealized P&L and position details"""
+        print(self.format_balance_sheet(current_equity, unrealized_pnl, position))
+    
+    def format_balance_sheet(self, current_equity: float, unrealized_pnl: float = 0, position: Dict = None) -> str:
+        """Render the balance sheet as one string, for callers that log instead of print"""
         stats = self.get_stats(current_equity)
         # Total account value includes unrealized P&L from open positions
         total_equity = current_equity + unrealized_pnl
         total_pnl = stats['total_pnl'] + unrealized_pnl
         total_pnl_pct = (total_pnl / stats['start_equity']) * 100 if stats['start_equity'] else 0
         
-        print("\n" + "="*60)
-        print("📊 BALANCE SHEET & P&L REPORT")
-        print("="*60)
-        print(f"Starting Equity:    ${stats['start_equity']:,.2f}")
-        print(f"Current Equity:     ${current_equity:,.2f}")
+        values = dict(stats, current_equity=current_equity, unrealized_pnl=unrealized_pnl,
+                      total_equity=total_equity, total_pnl=total_pnl, total_pnl_pct=total_pnl_pct)
+        report = BALANCE_HEADER_TEMPLATE.format_map(values)
         
         # Show open position details if any
         if position and abs(position.get('size', 0)) > 0.0001:
-            side = "LONG" if position['size'] > 0 else "SHORT"
-            size = abs(position['size'])
-            entry = position.get('entry_price', position.get('entry', 0))
-            print(f"Open Position:      {side} {size:.4f} ETH @ ${entry:.2f}")
-            print(f"Unrealized P&L:     ${unrealized_pnl:+,.2f}")
-        print(f"Total Account Value: ${total_equity:,.2f}")
-        print(f"Total P&L:          ${total_pnl:+,.2f} ({total_pnl_pct:+.2f}%)")
-        print("-"*60)
-        print(f"Closed Trades:      {stats['total_trades']}")
-        print(f"Winning Trades:     {stats['winning_trades']} ({stats['win_rate']:.1f}%)")
-        print(f"Losing Trades:      {stats['losing_trades']}")
-        print("-"*60)
-        print(f"Average Win:        ${stats['avg_win']:+,.2f}")
-        print(f"Average Loss:       ${stats['avg_loss']:+,.2f}")
-        print(f"Largest Win:        ${stats['largest_win']:+,.2f}")
-        print(f"Largest Loss:       ${stats['largest_loss']:+,.2f}")
-        print("="*60 + "\n")
+            values["side"] = "LONG" if position['size'] > 0 else "SHORT"
+            values["size"] = abs(position['size'])
+            values["entry"] = position.get('entry_price', position.get('entry', 0))
+            report += BALANCE_POSITION_TEMPLATE.format_map(values)
+        report += BALANCE_BODY_TEMPLATE.format_map(values)
+        return report
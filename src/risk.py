@@ -22,8 +22,9 @@ class FrequencyGuard:
         self.last_trades = []
         self.last_close_time: Optional[float] = None
 
-    def allow_new_trade(self) -> bool:
-        now = time.time()
+    def allow_new_trade(self, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.time()
         self.last_trades = [t for t in self.last_trades if now - t < 3600]
         if len(self.last_trades) >= self.max_trades_per_hour:
             return False
@@ -31,15 +32,30 @@ class FrequencyGuard:
             return False
         return True
 
-    def record_open(self):
-        self.last_trades.append(time.time())
+    def seconds_until_allowed(self, now: Optional[float] = None) -> float:
+        """Seconds until allow_new_trade() turns True (0 if it already is)."""
+        if now is None:
+            now = time.time()
+        wait = 0.0
+        recent = sorted(t for t in self.last_trades if now - t < 3600)
+        if len(recent) >= self.max_trades_per_hour:
+            # Enough of the oldest trades must age out of the hour window
+            wait = recent[len(recent) - self.max_trades_per_hour] + 3600 - now
+        if self.last_close_time:
+            wait = max(wait, self.last_close_time + self.cooldown_seconds - now)
+        return max(wait, 0.0)
 
-    def record_close(self):
-        self.last_close_time = time.time()
+    def record_open(self, now: Optional[float] = None):
+        self.last_trades.append(time.time() if now is None else now)
+
+    def record_close(self, now: Optional[float] = None):
+        self.last_close_time = time.time() if now is None else now
 
 
 def clamp_decision(decision: Dict, equity_fraction_cap: float) -> TradeDecision:
     raw = TradeDecision(**decision)
+    # Normalize once here so callers can compare side without .lower()
+    raw.side = raw.side.lower()
     raw.position_fraction = min(raw.position_fraction, equity_fraction_cap)
     if raw.side == "flat":
         raw.position_fraction = 0
@@ -53,6 +69,8 @@ class RiskManager:
         self.state_path = state_path
         os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
         self.state = self._load()
+        # Keep one handle open for the process lifetime; saves rewrite it in place
+        self._fh = self._open_state_file()
 
     def _load(self) -> Dict:
         if os.path.exists(self.state_path):
@@ -69,41 +87,59 @@ class RiskManager:
             "shutdown_until": 0,
         }
 
+    def _open_state_file(self):
+        # "r+" does not create the file, so make sure it exists first
+        if not os.path.exists(self.state_path):
+            open(self.state_path, "w", encoding="utf-8").close()
+        return open(self.state_path, "r+", encoding="utf-8")
+
     def _save(self):
-        with open(self.state_path, "w", encoding="utf-8") as f:
-            json.dump(self.state, f, indent=2)
+        self._fh.seek(0)
+        self._fh.write(json.dumps(self.state, indent=2))
+        self._fh.truncate()
+        self._fh.flush()
+
+    def close(self):
+        """Release the state file handle."""
+        if not self._fh.closed:
+            self._fh.close()
 
-    def _midnight_utc_ts(self) -> float:
+    def _midnight_utc_ts(self, now: Optional[float] = None) -> float:
         # Compute current UTC midnight epoch
-        t = time.gmtime()
+        t = time.gmtime(now)
         midnight = time.struct_time((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, t.tm_wday, t.tm_yday, 0))
         return time.mktime(midnight)
 
-    def ensure_day_initialized(self):
-        now_midnight = self._midnight_utc_ts()
+    def ensure_day_initialized(self, now: Optional[float] = None):
+        now_midnight = self._midnight_utc_ts(now)
         if self.state["day_start_ts"] != now_midnight:
             # New day: reset daily counters
             self.state["day_start_ts"] = now_midnight
             self.state["day_pnl"] = 0.0
             self._save()
 
-    def is_paused(self) -> bool:
-        return time.time() < float(self.state.get("paused_until", 0))
+    def is_paused(self, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.time()
+        return now < float(self.state.get("paused_until", 0))
 
-    def is_shutdown(self) -> bool:
-        return time.time() < float(self.state.get("shutdown_until", 0))
+    def is_shutdown(self, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.time()
+        return now < float(self.state.get("shutdown_until", 0))
 
-    def pause_for(self, seconds: int):
-        self.state["paused_until"] = time.time() + seconds
+    def pause_for(self, seconds: int, now: Optional[float] = None):
+        self.state["paused_until"] = (time.time() if now is None else now) + seconds
         self._save()
 
-    def shutdown_for(self, seconds: int):
-        self.state["shutdown_until"] = time.time() + seconds
+    def shutdown_for(self, seconds: int, now: Optional[float] = None):
+        self.state["shutdown_until"] = (time.time() if now is None else now) + seconds
         self._save()
 
-    def on_trade_closed(self, pnl: float, pause_after_losses: int, pause_duration_sec: int):
+    def on_trade_closed(self, pnl: float, pause_after_losses: int, pause_duration_sec: int,
+                        now: Optional[float] = None):
         """Update streaks and daily PnL, return flags for actions."""
-        self.ensure_day_initialized()
+        self.ensure_day_initialized(now)
         self.state["day_pnl"] = float(self.state.get("day_pnl", 0.0)) + float(pnl or 0)
         # Update loss streak
         if pnl < 0:
@@ -114,7 +150,7 @@ class RiskManager:
 
         triggered_pause = False
         if self.state["consecutive_losses"] >= pause_after_losses:
-            self.pause_for(pause_duration_sec)
+            self.pause_for(pause_duration_sec, now)
             triggered_pause = True
         return {
             "triggered_pause": triggered_pause,
@@ -122,6 +158,6 @@ class RiskManager:
             "day_pnl": self.state["day_pnl"],
         }
 
-    def get_day_pnl(self) -> float:
-        self.ensure_day_initialized()
+    def get_day_pnl(self, now: Optional[float] = None) -> float:
+        self.ensure_day_initialized(now)
         return float(self.state.get("day_pnl", 0.0))
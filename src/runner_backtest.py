@@ -6,9 +6,19 @@ from ai_client import AISignalClient
 from risk import clamp_decision
 
 
+_EXCHANGE = None
+
+
+def _exchange() -> ccxt.Exchange:
+    """Shared Binance client, created on first use and reused across fetches."""
+    global _EXCHANGE
+    if _EXCHANGE is None:
+        _EXCHANGE = ccxt.binance({"enableRateLimit": True})
+    return _EXCHANGE
+
+
 def fetch_ohlcv(limit: int = 200) -> List[Dict]:
-    exchange = ccxt.binance()
-    ohlcv = exchange.fetch_ohlcv("ETH/USDT", timeframe="5m", limit=limit)
+    ohlcv = _exchange().fetch_ohlcv("ETH/USDT", timeframe="5m", limit=limit)
     return [
         {"ts": c[0], "open": c[1], "high": c[2], "low": c[3], "close": c[4], "volume": c[5]}
         for c in ohlcv
@@ -1,10 +1,20 @@
+import sys
 import time
+import random
 import asyncio
-from typing import Dict, Optional
+import contextlib
+import logging
+import logging.handlers
+import queue
+from typing import Dict, List, Optional, Tuple
 
-import ccxt
+import ccxt.async_support as ccxt_async
+import ccxt.pro as ccxtpro
+import orjson
 
+from .account_cache import AccountCache
 from .ai_client import AISignalClient
+from .candle_cache import CandleCache
 from .config import load_settings
 from .exchange_hyperliquid import HyperliquidClient
 from .exchange_paper import PaperExchange
@@ -17,10 +27,296 @@ from .telegram_bot import TradingTelegramBot, schedule_daily_reports
 
 telegram_bot: Optional[TradingTelegramBot] = None
 
+# Trade-log records waiting for the background writer: (ts, record)
+_log_q: asyncio.Queue = asyncio.Queue()
+
+# Telegram calls waiting for the background sender: (method name, args, kwargs)
+_notify_q: asyncio.Queue = asyncio.Queue(maxsize=64)
+
+# Waits between position checks after an order (most fills show up on the first)
+SETTLE_POLL_DELAYS = (0.25, 0.5, 1.0, 2.0)
+
+# Seconds past a candle boundary before waking, so the closed bar is available
+CANDLE_CLOSE_GRACE = 0.5
+
+log = logging.getLogger("live")
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _setup_logging(level: int = logging.INFO) -> None:
+    """Route live-loop output through the "live" logger.
+
+    The loop only enqueues records; a QueueListener thread formats them and
+    writes to stdout, so a tick never stalls on terminal I/O.
+    """
+    global _log_listener
+    log.setLevel(level)
+    if _log_listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = logging.handlers.QueueListener(_log_queue, stream)
+    _log_listener.start()
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    log.propagate = False
+
+
+def _flush_log() -> None:
+    """Block until the listener has written every queued record.
+
+    Only needed before code that prints to stdout directly, so its output
+    doesn't overtake log lines still in the queue.
+    """
+    if _log_listener is not None:
+        _log_queue.join()
+
+
+def _stop_logging() -> None:
+    """Write out anything still queued and stop the listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def _next_candle_close(tf_sec: int = 300, after: Optional[float] = None) -> float:
+    """Epoch time of the first `tf_sec` candle close after `after` (default: now)."""
+    t = time.time() if after is None else after
+    return t + (tf_sec - t % tf_sec)
+
+
+def _until_candle_close(tf_sec: int = 300, after: Optional[float] = None) -> float:
+    """Seconds from now until just past the next candle close (see _next_candle_close)."""
+    return max(0.0, _next_candle_close(tf_sec, after) + CANDLE_CLOSE_GRACE - time.time())
+
+
+async def _wait_until(deadline: float, bar_closed: Optional[asyncio.Event] = None,
+                      wake: Optional[asyncio.Event] = None) -> None:
+    """Sleep until loop time `deadline`, or until `wake` is set.
+
+    With `bar_closed`, the next candle close ends the wait early; deadlines
+    from _until_candle_close() keep the loop aligned to candle boundaries
+    even if the candle stream is down. Neither event is cleared here, so a
+    set() that lands while the loop is busy still cuts the next wait short;
+    the caller clears them once handled.
+    """
+    timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+    waiters = [asyncio.ensure_future(e.wait()) for e in (bar_closed, wake) if e is not None]
+    if not waiters:
+        await asyncio.sleep(timeout)
+        return
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for w in waiters:
+            w.cancel()
+
+
+# (current position side, signal side) -> what the loop does with the signal
+_ACTIONS: Dict[Tuple[Optional[str], str], str] = {
+    (None, "long"): "open",
+    (None, "short"): "open",
+    (None, "flat"): "stay_flat",
+    ("long", "long"): "hold",
+    ("short", "short"): "hold",
+    ("long", "short"): "flip",  # close, then open the other side
+    ("short", "long"): "flip",
+    ("long", "flat"): "close",
+    ("short", "flat"): "close",
+}
+
+
+def _queue_trade_log(record: Dict) -> None:
+    """Hand a trade-log record to the background writer (stamped now)."""
+    _log_q.put_nowait((time.time(), record))
+
+
+def _write_trade_log(trade_log: TradeLogger, batch: List[Tuple[float, Dict]]) -> List[Tuple[float, Dict]]:
+    """Write `batch`, falling back to one record at a time if the batch fails.
+
+    Returns the records that hit an I/O error, for the caller to retry.
+    Records that cannot be serialized at all are logged in full and dropped.
+    """
+    try:
+        trade_log.log_batch(batch)
+        return []
+    except Exception as e:
+        log.warning(f"⚠️ Failed to write {len(batch)} trade log record(s), retrying one by one: {e}")
+    failed = []
+    for record in batch:
+        try:
+            trade_log.log_batch([record])
+        except OSError:
+            failed.append(record)
+        except Exception as e:
+            log.error(f"❌ Dropping unwritable trade log record {record!r}: {e}")
+    return failed
+
+
+async def _log_flusher(trade_log: TradeLogger) -> None:
+    """Drain queued trade-log records, writing each burst in one batch off the event loop.
+
+    Records that fail to write are retried after a pause. On cancellation
+    (shutdown, or another task in the group crashing) whatever is still
+    queued is written synchronously before the task exits.
+    """
+    batch: List[Tuple[float, Dict]] = []
+    try:
+        while True:
+            if batch:
+                # The last write failed: back off before retrying these records
+                await asyncio.sleep(5)
+            else:
+                batch.append(await _log_q.get())
+                # Let records from the same trade (close + open on a flip) coalesce
+                await asyncio.sleep(0.05)
+            while not _log_q.empty():
+                batch.append(_log_q.get_nowait())
+            # Once handed to the worker thread a batch is its responsibility
+            # (the thread finishes even if this task is cancelled meanwhile)
+            pending, batch = batch, []
+            batch = await asyncio.to_thread(_write_trade_log, trade_log, pending)
+            if batch:
+                log.warning(f"⚠️ {len(batch)} trade log record(s) kept for retry")
+    finally:
+        while not _log_q.empty():
+            batch.append(_log_q.get_nowait())
+        if batch:
+            for record in _write_trade_log(trade_log, batch):
+                log.error(f"❌ Trade log record lost on shutdown: {record!r}")
+
+
+def _notify(method: str, *args, **kwargs) -> None:
+    """Queue telegram_bot.<method>(*args, **kwargs) for the background sender,
+    so a slow Telegram API never stalls the trading loop."""
+    if telegram_bot is None:
+        return
+    try:
+        _notify_q.put_nowait((method, args, kwargs))
+    except asyncio.QueueFull:
+        log.warning(f"⚠️ Telegram queue full, dropping {method}")
+
+
+async def _notify_worker(bot: TradingTelegramBot) -> None:
+    """Send queued Telegram notifications in order."""
+    while True:
+        method, args, kwargs = await _notify_q.get()
+        try:
+            await getattr(bot, method)(*args, **kwargs)
+        except Exception as e:
+            log.warning(f"⚠️ Telegram {method} failed: {e}")
+
+
+@contextlib.asynccontextmanager
+async def _closing(*resources):
+    """close() each resource when the block exits, however it exits."""
+    try:
+        yield
+    finally:
+        for resource in resources:
+            try:
+                resource.close()
+            except Exception as e:
+                log.warning(f"⚠️ Failed to close {type(resource).__name__}: {e}")
+
+
+async def _make_spot_exchange() -> ccxt_async.Exchange:
+    """KuCoin REST client for candle data, built once per process.
+
+    ccxt's async client awaits its requests on the event loop (no worker
+    thread per fetch) and keeps its aiohttp connection pool warm between
+    ticks. The caller closes it (it is an async context manager).
+    """
+    spot = ccxt_async.kucoin({"enableRateLimit": True})
+    spot.open()  # create the aiohttp session now so it can be shared
+    try:
+        # Load market metadata up front rather than on the first tick
+        await spot.load_markets()
+    except Exception as e:
+        log.warning(f"⚠️ Could not preload KuCoin markets (will retry on first fetch): {e}")
+    return spot
+
+
+async def _fetch_candles(spot: ccxt_async.Exchange, cache: CandleCache, timeframe: str) -> None:
+    """Bring the cache up to date over REST.
+
+    Only bars from the newest cached one onward are downloaded; the first
+    call (empty cache) loads the full window.
+    """
+    since = cache.last_ts
+    ohlcv = await spot.fetch_ohlcv("ETH/USDT", timeframe=timeframe, since=since, limit=cache.limit)
+    if since is not None and len(ohlcv) >= cache.limit:
+        # Fell a whole window behind: reload the latest window instead
+        cache.clear()
+        ohlcv = await spot.fetch_ohlcv("ETH/USDT", timeframe=timeframe, limit=cache.limit)
+    cache.update(ohlcv)
+    cache.stale = False
+
+
+async def _current_price(spot: ccxt_async.Exchange, cache: CandleCache, timeframe: str, max_age: float = 30.0) -> float:
+    """Latest close from the cache, refreshed over REST first if the feed has
+    been quiet for more than `max_age` seconds."""
+    if time.monotonic() - cache.updated_at > max_age:
+        await _fetch_candles(spot, cache, timeframe)
+    return cache[-1]["close"]
+
+
+async def _backfill_candles(spot: ccxt_async.Exchange, cache: CandleCache, timeframe: str) -> None:
+    """Backfill a stale candle cache over REST."""
+    if cache.stale:
+        await _fetch_candles(spot, cache, timeframe)
+
+
+async def _kline_pump(spot_ws, cache: CandleCache, timeframe: str, bar_closed: Optional[asyncio.Event] = None) -> None:
+    """Keep `cache` current from the exchange's kline WebSocket.
+
+    Sets `bar_closed` (if given) whenever a new bar opens, i.e. the previous
+    one has closed. After a stream error or a skipped bar the cache is
+    marked stale so the loop backfills it over REST before using it.
+    """
+    tf_ms = spot_ws.parse_timeframe(timeframe) * 1000
+    backoff = 5
+    while True:
+        try:
+            ohlcv = await spot_ws.watch_ohlcv("ETH/USDT", timeframe)
+        except Exception as e:
+            cache.stale = True
+            log.warning(f"⚠️ {timeframe} candle stream error, retrying in {backoff}s: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 300)
+            continue
+        backoff = 5
+        if not ohlcv or cache.stale:
+            # REST backfill pending; it starts from the last cached bar
+            continue
+        last_ts = cache.last_ts
+        if last_ts is not None and ohlcv[0][0] > last_ts + tf_ms:
+            cache.stale = True
+            continue
+        cache.update(ohlcv)
+        if bar_closed is not None and last_ts is not None and cache.last_ts > last_ts:
+            bar_closed.set()
+
+
+async def _run_kline_streams(spot_ws, pumps: list) -> None:
+    """Run one _kline_pump per (cache, timeframe, bar_closed) over a shared
+    WebSocket client, closing the client when the streams are cancelled."""
+    try:
+        await asyncio.gather(*(_kline_pump(spot_ws, cache, tf, ev) for cache, tf, ev in pumps))
+    finally:
+        await spot_ws.close()
+
 
 async def run_live_async():
     global telegram_bot
+    # Python 3.12+: tasks that finish without suspending (most notifications)
+    # complete inside create_task instead of a round trip through the scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    _setup_logging()
     settings = load_settings()
+    _setup_logging(getattr(logging, settings.log_level.upper(), logging.INFO))
     history = HistoryStore()
     trade_log = TradeLogger()
     ai = AISignalClient(
@@ -59,12 +355,16 @@ async def run_live_async():
             testnet=settings.hyperliquid_testnet,
             base_url_override=settings.hyperliquid_base_url,
             account_address=settings.account_address,
+            skip_ws=False,  # userFills stream for fill confirmation
         )
     
     # Initialize P&L tracker with current wallet equity as baseline
     current_equity = ex.account().get("equity", settings.paper_initial_equity)
     pnl = PnLTracker(current_equity=current_equity)
     
+    # Set by the Telegram /scan command to cut the current wait short
+    scan_requested = asyncio.Event()
+    
     # Initialize Telegram bot if configured
     if settings.telegram_token and settings.telegram_chat_id:
         telegram_bot = TradingTelegramBot(
@@ -72,487 +372,607 @@ async def run_live_async():
             chat_id=settings.telegram_chat_id,
             hyperliquid_client=ex,
             pnl_tracker=pnl,
+            scan_requested=scan_requested,
         )
         await telegram_bot.start()
-        # Start daily report scheduler in background
-        asyncio.create_task(schedule_daily_reports(telegram_bot))
-        print("🤖 Telegram bot enabled")
+        log.info("🤖 Telegram bot enabled")
+    
+    # Settings read on every tick, bound once to plain locals
+    pair = settings.trading_pair
+    tf = settings.timeframe
+    bias_tf = settings.bias_timeframe
+    align_tf = settings.require_timeframe_alignment
+    max_frac = settings.max_position_fraction
+    vol_threshold = settings.volatility_threshold_pct
+    daily_loss_limit = settings.daily_loss_limit_pct
     
     guard = FrequencyGuard(settings.max_trades_per_hour, settings.cooldown_minutes)
+    # Account state is re-read after trades (invalidate) or once the TTL lapses
+    account_cache = AccountCache(ex, ttl=5.0)
     risk_manager = RiskManager()
-    spot = ccxt.kucoin()
-    rate_limit_backoff = 60  # Start with 60 second backoff on rate limit
+    spot = await _make_spot_exchange()
+    candle_cache = CandleCache(settings.candle_limit)
+    bias_cache = CandleCache(settings.bias_candle_limit)
+    
+    # Candles stream over one WebSocket; REST only seeds/backfills the caches
+    bar_closed = asyncio.Event()
+    pumps = [(candle_cache, tf, bar_closed)]
+    if align_tf:
+        pumps.append((bias_cache, bias_tf, None))
+    rate_limit_backoff = 1.0  # Base backoff on rate limit; doubles per consecutive 429, capped at 60s
+    
+    def _emit_trade_event(kind: str, record: Dict, now: float, size: float, entry: float,
+                          exit_price: Optional[float] = None, pnl_value: Optional[float] = None,
+                          notify: Optional[Tuple[tuple, Dict]] = None) -> None:
+        """
+        Record one trade open/close ("open" or "close") everywhere trades are
+        tracked: P&L tracker, frequency guard, account cache, the trade log
+        (background writer) and Telegram (background sender, `notify` holds
+        the (args, kwargs) for notify_trade_opened/closed).
+        """
+        pnl.record_trade(kind, size, entry, exit_price, pnl_value, now=now)
+        _queue_trade_log(record)
+        if kind == "open":
+            guard.record_open(now)
+        else:
+            guard.record_close(now)
+        account_cache.invalidate()
+        if notify is not None:
+            args, kwargs = notify
+            _notify("notify_trade_opened" if kind == "open" else "notify_trade_closed", *args, **kwargs)
+    
+    async def _close_position(pos: Dict, side: str, market_price: float, now: float,
+                              reason: Optional[str] = None) -> Tuple[Dict, float, float]:
+        """
+        Close `pos` and do the shared bookkeeping: P&L and risk-manager
+        records, Telegram notices, trade log, guard and account cache.
+        
+        Returns (close_result, close_price, pnl_value); call sites keep their
+        own logging and reset the hold timer / AI history.
+        """
+        # Signed exchange calls block on HTTPS; keep them off the event loop
+        if use_paper:
+            close_result = await asyncio.to_thread(ex.close_position, pair, price=market_price)
+        else:
+            close_result = await asyncio.to_thread(ex.close_position, pair)
+        
+        # Get actual close price from result or use market price
+        close_price = close_result.get("close_price") or market_price
+        size = abs(pos.get("size", 0))
+        entry = pos.get("entry", 0)
+        
+        # Record P&L (use result PNL if available, otherwise calculate)
+        pnl_value = close_result.get("pnl", 0)
+        if pnl_value == 0:
+            if side == "long":
+                pnl_value = (close_price - entry) * size
+            else:
+                pnl_value = (entry - close_price) * size
+        
+        decision = {"side": "close", "reason": reason} if reason else {"side": "close"}
+        _emit_trade_event(
+            "close",
+            {"decision": decision, "result": close_result, "price": close_price, "pnl": pnl_value},
+            now, size, entry, exit_price=close_price, pnl_value=pnl_value,
+            notify=((side, size, entry, close_price, pnl_value), {}),
+        )
+        
+        # Update risk manager streak/daily PnL
+        rm_update = risk_manager.on_trade_closed(
+            pnl_value,
+            settings.pause_consecutive_losses,
+            settings.pause_duration_hours * 3600,
+            now=now,
+        )
+        if rm_update["triggered_pause"]:
+            _notify(
+                "notify_paused",
+                reason=f"{rm_update['consecutive_losses']} losses in a row",
+                hours=settings.pause_duration_hours,
+            )
+        return close_result, close_price, pnl_value
     
     # Track when positions are opened to enforce minimum hold time
     position_opened_at = None
     minimum_hold_minutes = 15  # Don't close positions for at least 15 minutes
+    
+    # Newest candle and position the AI was last asked about; the signal is
+    # not re-requested until either one changes
+    last_sig_key = None
+    
+    # Loop time at which the next tick starts, and whether a candle close may
+    # start it early (None: start right away)
+    loop = asyncio.get_running_loop()
+    next_wake: Optional[float] = None
+    wake_on_bar = False
 
-    while True:
-        try:
-            # Fetch 5m candles for execution
-            ohlcv = spot.fetch_ohlcv("ETH/USDT", timeframe=settings.timeframe, limit=settings.candle_limit)
-            candles = [{"ts": c[0], "open": c[1], "high": c[2], "low": c[3], "close": c[4], "volume": c[5]} for c in ohlcv]
-            
-            # Fetch 15m candles for bias determination
-            candles_15m = None
-            if settings.require_timeframe_alignment:
-                ohlcv_15m = spot.fetch_ohlcv("ETH/USDT", timeframe=settings.bias_timeframe, limit=settings.bias_candle_limit)
-                candles_15m = [{"ts": c[0], "open": c[1], "high": c[2], "low": c[3], "close": c[4], "volume": c[5]} for c in ohlcv_15m]
+    # The WebSocket client rides on the REST client's aiohttp session (it
+    # leaves a session it was given open; spot closes it on exit), so the
+    # REST token request KuCoin needs before each WS connect reuses a warm
+    # connection
+    spot_ws = ccxtpro.kucoin({"session": spot.session})
+    if spot.markets:
+        # Reuse the REST client's market metadata instead of downloading it again
+        spot_ws.set_markets(spot.markets, spot.currencies)
+    
+    # Background tasks share the trading loop's lifetime: if one of them
+    # crashes the loop is cancelled too (instead of the error being lost),
+    # and leaving the loop cancels them all, then closes the REST client and
+    # finally the exchange client's fill stream, the AI client's HTTP pool
+    # and the risk state file
+    async with _closing(ex, ai, risk_manager), spot, asyncio.TaskGroup() as tg:
+        tg.create_task(_log_flusher(trade_log))
+        tg.create_task(_run_kline_streams(spot_ws, pumps))
+        if telegram_bot:
+            tg.create_task(_notify_worker(telegram_bot))
+            # Daily report scheduler
+            tg.create_task(schedule_daily_reports(telegram_bot))
+        
+        while True:
+            # Every branch that ends the tick early just schedules its wake-up
+            # and continues; the single wait happens here
+            if next_wake is not None:
+                await _wait_until(next_wake, bar_closed if wake_on_bar else None, scan_requested)
+                next_wake = None
+            # This tick reads every bar closed so far; one that closes while it
+            # runs (e.g. during the AI call) sets the event again and ends the
+            # next wait right away instead of being missed
+            bar_closed.clear()
+            if scan_requested.is_set():
+                # Manual scan: ask the AI again even if nothing changed since
+                # the last signal (the trade guard still applies)
+                scan_requested.clear()
+                last_sig_key = None
+                log.info("🔍 Manual scan requested")
             
-            price = candles[-1]["close"]
+            # One clock read per tick, shared by the guard, risk manager and tracker
+            now = time.time()
+            try:
+                # 5m candles for execution and 15m candles for bias determination
+                # (streamed; REST only to backfill), plus account and positions
+                # ONCE at start of loop. Candle backfills are awaited on the loop
+                # and the (synchronous) account reads run in worker threads, so
+                # all of them overlap. Each result is checked on its own: a failed
+                # backfill falls back to the candles already cached (the cache
+                # stays stale, so it is retried next tick).
+                candle_res, bias_res, account_res = await asyncio.gather(
+                    _backfill_candles(spot, candle_cache, tf),
+                    _backfill_candles(spot, bias_cache, bias_tf)
+                    if align_tf else asyncio.sleep(0),
+                    account_cache.get(),
+                    return_exceptions=True,
+                )
+                if isinstance(account_res, BaseException):
+                    raise account_res
+                for res, cache, cache_tf in ((candle_res, candle_cache, tf),
+                                             (bias_res, bias_cache, bias_tf)):
+                    if isinstance(res, BaseException):
+                        if not len(cache):
+                            raise res
+                        log.warning(f"⚠️ {cache_tf} candle backfill failed, using cached candles: {res}")
+                account, open_positions = account_res
             
-            # Get current positions ONCE at start of loop
-            account = ex.account()
-            equity = account.get("equity", 0)
-            open_positions = ex.positions()
+                # Read straight from the cache; the candle lists are only copied
+                # out once the AI is actually queried
+                price = candle_cache[-1]["close"]
+                equity = account.get("equity", 0)
             
-            # Reset backoff on successful query
-            rate_limit_backoff = 60
+                # Reset backoff on successful query
+                rate_limit_backoff = 1.0
         
-        except Exception as e:
-            # Handle rate limit errors (429) from Hyperliquid
-            error_str = str(e)
-            if "429" in error_str or "rate" in error_str.lower():
-                print(f"⚠️ Rate limit hit, backing off for {rate_limit_backoff}s...")
-                await asyncio.sleep(rate_limit_backoff)
-                rate_limit_backoff = min(rate_limit_backoff * 2, 600)  # Max 10 min backoff
-                continue
-            else:
-                # Other errors - log and retry after 5 minutes
-                print(f"❌ Error querying exchange: {e}")
-                await asyncio.sleep(300)
-                continue
+            except Exception as e:
+                # Handle rate limit errors (429) from Hyperliquid
+                error_str = str(e)
+                if "429" in error_str or "rate" in error_str.lower():
+                    # Jittered so retries don't land in lockstep with other clients
+                    # on the same IP/account
+                    delay = min(rate_limit_backoff, 60) * random.uniform(0.5, 1.5)
+                    log.warning(f"⚠️ Rate limit hit, backing off for {delay:.1f}s...")
+                    next_wake, wake_on_bar = loop.time() + delay, False
+                    rate_limit_backoff = min(rate_limit_backoff * 2, 60)
+                    continue
+                else:
+                    # Other errors - log and retry after 5 minutes
+                    log.warning(f"❌ Error querying exchange: {e}")
+                    next_wake, wake_on_bar = loop.time() + 300, False
+                    continue
         
-        # Log position status
-        if open_positions:
-            pos = open_positions[0]
-            side = "LONG" if pos.get("size", 0) > 0 else "SHORT"
-            print(f"📍 Position: {side} {abs(pos.get('size', 0)):.4f} ETH @ ${pos.get('entry', 0):.2f}")
+            # Unpack the position once per tick; everything below reuses these
+            current_position = open_positions[0] if open_positions else None
+            pos_size = current_position.get("size", 0) if current_position else 0
+            entry_price = current_position.get("entry", 0) if current_position else 0
+            current_side = "long" if pos_size > 0 else "short" if pos_size < 0 else None
+            
+            # Log position status
+            if current_position:
+                log.info(f"📍 Position: {'LONG' if pos_size > 0 else 'SHORT'} {abs(pos_size):.4f} ETH @ ${entry_price:.2f}")
         
-        # Check for liquidation in paper mode
-        if use_paper and hasattr(ex, 'check_liquidation'):
-            if ex.check_liquidation(price):
-                print("💥 Position liquidated due to excessive loss")
-                await asyncio.sleep(300)  # Wait 5 minutes before next trade
-                continue
+            # Check for liquidation in paper mode
+            if use_paper and hasattr(ex, 'check_liquidation'):
+                if ex.check_liquidation(price):
+                    account_cache.invalidate()
+                    log.warning("💥 Position liquidated due to excessive loss")
+                    next_wake, wake_on_bar = loop.time() + _until_candle_close(), True  # Wait for the next candle before trading
+                    continue
         
-        # Calculate unrealized P&L from open position and check SL/TP levels
-        unrealized_pnl = 0
-        position_value = 0
-        sl_distance_pct = None
-        tp_distance_pct = None
-        sl_hit = False
-        tp_hit = False
+            # Calculate unrealized P&L from open position and check SL/TP levels
+            unrealized_pnl = 0
+            position_value = 0
+            sl_distance_pct = None
+            tp_distance_pct = None
+            sl_hit = False
+            tp_hit = False
         
-        if open_positions:
-            pos = open_positions[0]
-            pos_size = pos.get("size", 0)
-            entry_price = pos.get("entry", 0)
-            if pos_size != 0 and entry_price != 0:
-                position_value = abs(pos_size) * price
-                unrealized_pnl = (price - entry_price) * pos_size
-                pnl_pct = ((price - entry_price) / entry_price) * (1 if pos_size > 0 else -1)
+            if current_position:
+                if pos_size != 0 and entry_price != 0:
+                    position_value = abs(pos_size) * price
+                    unrealized_pnl = (price - entry_price) * pos_size
+                    pnl_pct = ((price - entry_price) / entry_price) * (1 if pos_size > 0 else -1)
                 
-                # Check stored SL/TP from last decision
-                recent_decisions = history.recent_decisions(hours=3)
-                last_decision = recent_decisions[-1].get('decision', {}) if recent_decisions else {}
-                sl_pct = last_decision.get('stop_loss_pct', 0)
-                tp_pct = last_decision.get('take_profit_pct', 0)
+                    # Check stored SL/TP from last decision
+                    recent_decisions = history.recent_decisions(hours=3)
+                    last_decision = recent_decisions[-1].get('decision', {}) if recent_decisions else {}
+                    sl_pct = last_decision.get('stop_loss_pct', 0)
+                    tp_pct = last_decision.get('take_profit_pct', 0)
                 
-                if sl_pct > 0:
-                    if pos_size > 0:  # LONG
-                        sl_distance_pct = pnl_pct + sl_pct  # positive if above SL
-                        sl_hit = price <= entry_price * (1 - sl_pct)
-                    else:  # SHORT
-                        sl_distance_pct = -pnl_pct + sl_pct
-                        sl_hit = price >= entry_price * (1 + sl_pct)
+                    if sl_pct > 0:
+                        if pos_size > 0:  # LONG
+                            sl_distance_pct = pnl_pct + sl_pct  # positive if above SL
+                            sl_hit = price <= entry_price * (1 - sl_pct)
+                        else:  # SHORT
+                            sl_distance_pct = -pnl_pct + sl_pct
+                            sl_hit = price >= entry_price * (1 + sl_pct)
                 
-                if tp_pct > 0:
-                    if pos_size > 0:  # LONG
-                        tp_distance_pct = tp_pct - pnl_pct  # positive if below TP
-                        tp_hit = price >= entry_price * (1 + tp_pct)
-                    else:  # SHORT
-                        tp_distance_pct = tp_pct + pnl_pct
-                        tp_hit = price <= entry_price * (1 - tp_pct)
+                    if tp_pct > 0:
+                        if pos_size > 0:  # LONG
+                            tp_distance_pct = tp_pct - pnl_pct  # positive if below TP
+                            tp_hit = price >= entry_price * (1 + tp_pct)
+                        else:  # SHORT
+                            tp_distance_pct = tp_pct + pnl_pct
+                            tp_hit = price <= entry_price * (1 - tp_pct)
                 
-                print(f"💰 Unrealized P&L: ${unrealized_pnl:+.2f} ({pnl_pct*100:+.2f}%)")
-                if sl_distance_pct is not None:
-                    print(f"🛡️ Stop Loss: {sl_distance_pct*100:+.2f}% away" + (" ❌ HIT" if sl_hit else ""))
-                if tp_distance_pct is not None:
-                    print(f"🎯 Take Profit: {tp_distance_pct*100:+.2f}% away" + (" ✅ HIT" if tp_hit else ""))
+                    log.info(f"💰 Unrealized P&L: ${unrealized_pnl:+.2f} ({pnl_pct*100:+.2f}%)")
+                    if sl_distance_pct is not None:
+                        if sl_hit:
+                            log.warning(f"🛡️ Stop Loss: {sl_distance_pct*100:+.2f}% away ❌ HIT")
+                        else:
+                            log.info(f"🛡️ Stop Loss: {sl_distance_pct*100:+.2f}% away")
+                    if tp_distance_pct is not None:
+                        log.info(f"🎯 Take Profit: {tp_distance_pct*100:+.2f}% away" + (" ✅ HIT" if tp_hit else ""))
                 
-                # Auto-close if SL/TP hit (paper mode or backup for trigger failure)
-                if (sl_hit or tp_hit) and use_paper:
-                    reason = "Stop Loss" if sl_hit else "Take Profit"
-                    print(f"🔔 {reason} triggered @ ${price:.2f}, closing position...")
-                    close_result = ex.close_position(settings.trading_pair, price=price)
-                    pnl_value = close_result.get("pnl", unrealized_pnl)
-                    pnl.record_trade("close", abs(pos_size), entry_price, price, pnl_value)
-                    rm_update = risk_manager.on_trade_closed(
-                        pnl_value,
-                        settings.pause_consecutive_losses,
-                        settings.pause_duration_hours * 3600,
-                    )
-                    if telegram_bot:
-                        await telegram_bot.notify_trade_closed(
-                            "long" if pos_size > 0 else "short",
-                            abs(pos_size),
-                            entry_price,
-                            price,
-                            pnl_value
-                        )
-                    trade_log.log_trade({"decision": {"side": "close", "reason": reason}, "result": close_result, "price": price})
-                    guard.record_close()
-                    position_opened_at = None  # Reset position timer
+                    # Auto-close if SL/TP hit (paper mode or backup for trigger failure)
+                    if (sl_hit or tp_hit) and use_paper:
+                        reason = "Stop Loss" if sl_hit else "Take Profit"
+                        log.info(f"🔔 {reason} triggered @ ${price:.2f}, closing position...")
+                        await _close_position(current_position, current_side, price, now, reason=reason)
+                        position_opened_at = None  # Reset position timer
                     
-                    # Clear AI history for fresh start on next trade
-                    history.clear_history()
+                        # Clear AI history for fresh start on next trade
+                        history.clear_history()
                     
-                    await asyncio.sleep(300)
-                    continue
+                        next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                        continue
         
-        # Pass position object to balance sheet instead of position_value
-        current_position = open_positions[0] if open_positions else None
-        pnl.print_balance_sheet(equity, unrealized_pnl, current_position)
+            # Pass position object to balance sheet instead of position_value
+            # Only re-render when equity, position or price actually moved
+            if pnl.balance_sheet_changed(equity, current_position, price):
+                log.info(pnl.format_balance_sheet(equity, unrealized_pnl, current_position))
         
-        # Respect pause/shutdown windows
-        if risk_manager.is_shutdown():
-            print("🛑 Bot in shutdown window; sleeping 10 minutes")
-            await asyncio.sleep(600)
-            continue
-        if risk_manager.is_paused():
-            print("⏸️ Bot paused; sleeping 10 minutes")
-            await asyncio.sleep(600)
-            continue
+            # Respect pause/shutdown windows
+            if risk_manager.is_shutdown(now):
+                log.warning("🛑 Bot in shutdown window; sleeping 10 minutes")
+                next_wake, wake_on_bar = loop.time() + 600, False
+                continue
+            if risk_manager.is_paused(now):
+                log.info("⏸️ Bot paused; sleeping 10 minutes")
+                next_wake, wake_on_bar = loop.time() + 600, False
+                continue
 
-        # Volatility filter: skip during extreme spikes unless explicitly desired
-        prev_close = candles[-2]["close"] if len(candles) >= 2 else price
-        spike_pct = abs(price - prev_close) / prev_close if prev_close > 0 else 0
-        if spike_pct >= settings.volatility_threshold_pct:
-            print(f"⚠️ Volatility spike {spike_pct*100:.2f}% ≥ {settings.volatility_threshold_pct*100:.2f}% — skipping this cycle")
-            if telegram_bot:
-                await telegram_bot.send_message(
-                    f"⚠️ Volatility filter: Skipping trade (5m move {spike_pct*100:.2f}%)"
-                )
-            await asyncio.sleep(300)
-            continue
+            # Volatility filter: skip during extreme spikes unless explicitly desired
+            prev_close = candle_cache[-2]["close"] if len(candle_cache) >= 2 else price
+            spike_pct = abs(price - prev_close) / prev_close if prev_close > 0 else 0
+            if spike_pct >= vol_threshold:
+                log.warning(f"⚠️ Volatility spike {spike_pct*100:.2f}% ≥ {vol_threshold*100:.2f}% — skipping this cycle")
+                if telegram_bot:
+                    _notify(
+                        "send_message",
+                        f"⚠️ Volatility filter: Skipping trade (5m move {spike_pct*100:.2f}%)"
+                    )
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                continue
 
-        # Check if we should query AI (respect cooldown)
-        # If in a position, allow monitoring every cycle; if flat, respect cooldown
-        if not current_position and not guard.allow_new_trade():
-            print(f"⏸️  Cooldown active, waiting...")
-            await asyncio.sleep(60)  # Check again in 1 minute
-            continue
+            # Check if we should query AI (respect cooldown)
+            # If in a position, allow monitoring every cycle; if flat, respect cooldown
+            if not current_position and not guard.allow_new_trade(now):
+                # Sleep until the guard reopens (capped so the balance sheet keeps printing)
+                wait = min(guard.seconds_until_allowed(), 300)
+                log.info(f"⏸️  Cooldown active, waiting {wait:.0f}s...")
+                next_wake, wake_on_bar = loop.time() + wait, False
+                continue
         
-        # Current position passed to AI for monitoring/decision routing
-        current_position = open_positions[0] if open_positions else None
-        decision_raw: Dict = ai.fetch_signal(candles, candles_15m=candles_15m, current_position=current_position)
-        trade = clamp_decision(decision_raw, settings.max_position_fraction)
-
-        # Determine current position state
-        current_pos = open_positions[0] if open_positions else None
-        current_side = None
-        if current_pos:
-            size = current_pos.get("size", 0)
-            if size > 0:
-                current_side = "long"
-            elif size < 0:
-                current_side = "short"
-
-        # Decision logic: close/flip/hold/open based on signal
-        if trade.side == "flat":
-            if current_pos:
-                # Check if minimum hold time has passed
-                if position_opened_at is not None:
-                    minutes_held = (time.time() - position_opened_at) / 60
-                    if minutes_held < minimum_hold_minutes:
-                        print(f"⏳ Position held for {minutes_held:.1f}m < {minimum_hold_minutes}m minimum - refusing to close")
-                        print(f"   AI wanted to close but we're enforcing minimum hold time")
-                        await asyncio.sleep(300)  # Wait 5 minutes before checking again
-                        continue
-                
-                # Claude wants to close position
-                ohlcv_close = spot.fetch_ohlcv("ETH/USDT", timeframe="5m", limit=1)
-                close_price = ohlcv_close[0][4]
-                if use_paper:
-                    close_result = ex.close_position(settings.trading_pair, price=close_price)
-                else:
-                    close_result = ex.close_position(settings.trading_pair)
-                
-                # Record P&L
-                if "pnl" in close_result:
-                    pnl_value = close_result["pnl"]
-                    pnl.record_trade("close", abs(current_pos.get("size", 0)), current_pos.get("entry", 0), close_price, pnl_value)
-                    # Update risk manager streak/daily PnL
-                    rm_update = risk_manager.on_trade_closed(
-                        pnl_value,
-                        settings.pause_consecutive_losses,
-                        settings.pause_duration_hours * 3600,
-                    )
-                    # Send Telegram notification
-                    if telegram_bot:
-                        await telegram_bot.notify_trade_closed(
-                            current_side,
-                            abs(current_pos.get("size", 0)),
-                            current_pos.get("entry", 0),
-                            close_price,
-                            pnl_value
-                        )
-                        if rm_update["triggered_pause"]:
-                            await telegram_bot.notify_paused(
-                                reason=f"{rm_update['consecutive_losses']} losses in a row",
-                                hours=settings.pause_duration_hours,
-                            )
+            # Same candle, same position: the AI would see identical input, so
+            # wait for the next bar instead of paying for another call
+            sig_key = (
+                candle_cache.last_ts,
+                (pos_size, entry_price) if current_position else None,
+            )
+            if sig_key == last_sig_key:
+                remaining = _until_candle_close()
+                log.info(f"💤 No new candle since last signal, waiting {remaining:.0f}s...")
+                next_wake, wake_on_bar = loop.time() + remaining, True
+                continue
+            last_sig_key = sig_key
+        
+            _flush_log()  # the AI client prints its own analysis
+            candles = candle_cache.snapshot()
+            candles_15m = bias_cache.snapshot() if align_tf else None
+            # Current position passed to AI for monitoring/decision routing.
+            # The client is synchronous and the call takes seconds (filters,
+            # chart rendering, model requests), so it runs in a worker thread
+            # while the candle streams and Telegram tasks keep running
+            try:
+                decision_raw: Dict = await asyncio.to_thread(
+                    ai.fetch_signal, candles, candles_15m=candles_15m, current_position=current_position
+                )
+                trade = clamp_decision(decision_raw, max_frac)
+            except Exception as e:
+                # One bad signal must not take the loop down; allow a retry
+                # on the same candle (e.g. via /scan) and try again next bar
+                log.warning(f"❌ AI signal failed: {e}")
+                last_sig_key = None
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                continue
+
+            # Decision logic: close/flip/hold/open based on signal (see _ACTIONS)
+            action = _ACTIONS.get((current_side, trade.side))
+            if action is None:
+                log.warning(f"Signal: unrecognised side {trade.side!r} → ignoring")
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                continue
+            
+            if action in ("close", "stay_flat"):
+                if action == "close":
+                    # Check if minimum hold time has passed
+                    if position_opened_at is not None:
+                        minutes_held = (now - position_opened_at) / 60
+                        if minutes_held < minimum_hold_minutes:
+                            log.info(f"⏳ Position held for {minutes_held:.1f}m < {minimum_hold_minutes}m minimum - refusing to close")
+                            log.info(f"   AI wanted to close but we're enforcing minimum hold time")
+                            next_wake, wake_on_bar = loop.time() + _until_candle_close(), True  # Check again on the next candle
+                            continue
                 
-                trade_log.log_trade({"decision": {"side": "close"}, "result": close_result, "price": close_price})
-                print(f"Signal: flat → Position closed @ {close_price}, result={close_result}")
-                guard.record_close()
-                position_opened_at = None  # Reset position timer
+                    # Claude wants to close position at the latest streamed close
+                    market_price = await _current_price(spot, candle_cache, tf)
+                    close_result, close_price, _ = await _close_position(current_position, current_side, market_price, now)
+                    log.info(f"Signal: flat → Position closed @ {close_price}, result={close_result}")
+                    position_opened_at = None  # Reset position timer
                 
-                # Clear AI history for fresh start on next trade
-                history.clear_history()
+                    # Clear AI history for fresh start on next trade
+                    history.clear_history()
                 
-                # Notify going neutral
-                if telegram_bot:
-                    await telegram_bot.notify_neutral()
-            else:
-                print(f"Signal: flat → No position, staying flat")
-            # Wait 5 minutes before next query
-            await asyncio.sleep(300)
-            continue
+                    # Notify going neutral
+                    if telegram_bot:
+                        _notify("notify_neutral")
+                else:
+                    log.info(f"Signal: flat → No position, staying flat")
+                # Wait for the next candle close before querying again
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                continue
 
-        # Note: We IGNORE trade.position_fraction - always use settings.max_position_fraction (80%)
-        # Claude's position_fraction is informational only
+            # Note: We IGNORE trade.position_fraction - always use settings.max_position_fraction (80%)
+            # Claude's position_fraction is informational only
 
-        # Check if we need to flip or can hold existing position
-        if current_pos and current_side == trade.side:
-            print(f"Signal: {trade.side} → Already in {current_side} position, holding")
-            # Wait longer when holding to avoid rate limits (5 minutes)
-            await asyncio.sleep(300)
-            continue
+            # Check if we need to flip or can hold existing position
+            if action == "hold":
+                log.info(f"Signal: {trade.side} → Already in {current_side} position, holding")
+                # Wait for the next candle close (at most 5 minutes) to avoid rate limits
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+                continue
 
-        # Close opposite position before opening new
-        if current_pos and current_side != trade.side:
-            ohlcv_close = spot.fetch_ohlcv("ETH/USDT", timeframe="5m", limit=1)
-            market_price = ohlcv_close[0][4]
-            if use_paper:
-                close_result = ex.close_position(settings.trading_pair, price=market_price)
-            else:
-                close_result = ex.close_position(settings.trading_pair)
-            
-            # Get actual close price from result or use market price
-            close_price = close_result.get("close_price") or market_price
+            # Close opposite position before opening new
+            if action == "flip":
+                market_price = await _current_price(spot, candle_cache, tf)
+                _, close_price, pnl_value = await _close_position(current_position, current_side, market_price, now)
+                log.info(f"Signal: {trade.side} → Closed {current_side} position @ ${close_price:.2f} (P&L: ${pnl_value:+.2f})")
+                position_opened_at = None  # Reset position timer before opening new position
             
-            # Record P&L (use result PNL if available, otherwise calculate)
-            pnl_value = close_result.get("pnl", 0)
-            if pnl_value == 0:
-                # Calculate manually if not provided
-                entry = current_pos.get("entry", 0)
-                size = abs(current_pos.get("size", 0))
-                if current_side.lower() == "long":
-                    pnl_value = (close_price - entry) * size
-                else:
-                    pnl_value = (entry - close_price) * size
-            
-            pnl.record_trade("close", abs(current_pos.get("size", 0)), current_pos.get("entry", 0), close_price, pnl_value)
-            rm_update = risk_manager.on_trade_closed(
-                pnl_value,
-                settings.pause_consecutive_losses,
-                settings.pause_duration_hours * 3600,
-            )
+                # Clear AI history for fresh start on next trade
+                history.clear_history()
             
-            # Send Telegram notification
-            if telegram_bot:
-                await telegram_bot.notify_trade_closed(
-                    current_side,
-                    abs(current_pos.get("size", 0)),
-                    current_pos.get("entry", 0),
-                    close_price,
-                    pnl_value
+                # Let the close settle; the post-close equity and latest price
+                # for sizing the new position are fetched during the wait
+                # instead of after it (on failure the tick's values stand)
+                _, account_res, price_res = await asyncio.gather(
+                    asyncio.sleep(5),
+                    account_cache.get(force=True),
+                    _current_price(spot, candle_cache, tf),
+                    return_exceptions=True,
                 )
-                if rm_update["triggered_pause"]:
-                    await telegram_bot.notify_paused(
-                        reason=f"{rm_update['consecutive_losses']} losses in a row",
-                        hours=settings.pause_duration_hours,
-                    )
-            
-            trade_log.log_trade({"decision": {"side": "close"}, "result": close_result, "price": close_price, "pnl": pnl_value})
-            print(f"Signal: {trade.side} → Closed {current_side} position @ ${close_price:.2f} (P&L: ${pnl_value:+.2f})")
-            guard.record_close()
-            position_opened_at = None  # Reset position timer before opening new position
-            
-            # Clear AI history for fresh start on next trade
-            history.clear_history()
-            
-            await asyncio.sleep(5)
+                if isinstance(account_res, BaseException):
+                    log.warning(f"⚠️ Post-close account refresh failed, sizing on pre-close equity: {account_res}")
+                else:
+                    equity = account_res[0].get("equity", equity)
+                if not isinstance(price_res, BaseException):
+                    price = price_res
 
-        # Open new position - Use 100% of equity as margin, then apply 10x leverage
-        margin = equity * settings.max_position_fraction  # Margin = money at risk
-        leverage = 10.0  # 10x leverage
-        notional_value = margin * leverage  # Actual position value with leverage
+            # Open new position - Use 100% of equity as margin, then apply 10x leverage
+            margin = equity * max_frac  # Margin = money at risk
+            leverage = 10.0  # 10x leverage
+            notional_value = margin * leverage  # Actual position value with leverage
         
-        print(f"🔧 DEBUG: settings.max_position_fraction = {settings.max_position_fraction}")
-        print(f"🔧 DEBUG: equity = ${equity:.2f}")
-        print(f"🔧 DEBUG: margin (money in) = ${margin:.2f}")
-        print(f"🔧 DEBUG: leverage = {leverage}x")
-        print(f"🔧 DEBUG: notional position value = ${notional_value:.2f}")
-        print(f"🔧 DEBUG: Claude's position_fraction (IGNORED) = {trade.position_fraction}")
+            log.debug(f"🔧 DEBUG: settings.max_position_fraction = {max_frac}")
+            log.debug(f"🔧 DEBUG: equity = ${equity:.2f}")
+            log.debug(f"🔧 DEBUG: margin (money in) = ${margin:.2f}")
+            log.debug(f"🔧 DEBUG: leverage = {leverage}x")
+            log.debug(f"🔧 DEBUG: notional position value = ${notional_value:.2f}")
+            log.debug(f"🔧 DEBUG: Claude's position_fraction (IGNORED) = {trade.position_fraction}")
         
-        # Hyperliquid requires minimum $10 order value, use $11 to be safe
-        if notional_value < 11:
-            print(f"⚠️ Position size ${notional_value:.2f} below minimum ($11), increasing to $11")
-            notional_value = 11
+            # Hyperliquid requires minimum $10 order value, use $11 to be safe
+            if notional_value < 11:
+                log.warning(f"⚠️ Position size ${notional_value:.2f} below minimum ($11), increasing to $11")
+                notional_value = 11
         
-        size = notional_value / price  # Convert notional value to ETH amount
+            size = notional_value / price  # Convert notional value to ETH amount
         
-        print(f"💰 Position: ${margin:.2f} margin × {leverage}x = ${notional_value:.2f} notional ({size:.4f} ETH @ ${price:.2f})")
+            log.info(f"💰 Position: ${margin:.2f} margin × {leverage}x = ${notional_value:.2f} notional ({size:.4f} ETH @ ${price:.2f})")
         
-        if use_paper:
-            result = ex.place_market(settings.trading_pair, trade.side, size, trade.max_slippage_pct, price=price)
-        else:
-            result = ex.place_market(settings.trading_pair, trade.side, size, trade.max_slippage_pct)
+            if use_paper:
+                result = await asyncio.to_thread(ex.place_market, pair, trade.side, size, trade.max_slippage_pct, price=price)
+            else:
+                result = await asyncio.to_thread(ex.place_market, pair, trade.side, size, trade.max_slippage_pct)
         
-        # Wait up to 5 seconds for position to settle
-        print("⏳ Waiting for position to settle...")
-        position_found = False
-        for attempt in range(5):
-            await asyncio.sleep(1)
-            verification = ex.positions()
-            if verification and abs(verification[0].get('size', 0)) >= size * 0.9:
-                verified_pos = verification[0]
-                print(f"✅ Position verified: {trade.side.upper()} {abs(verified_pos.get('size', 0)):.4f} ETH @ ${verified_pos.get('entry_price', verified_pos.get('entry', 0)):.2f}")
+            # The fill itself (order response or fill stream) verifies the
+            # position when it covers the order; otherwise poll positions with
+            # jittered exponential backoff (~4s worst case)
+            log.info("⏳ Waiting for position to settle...")
+            fill = await asyncio.to_thread(ex.wait_for_fill, result, 2.0)
+            position_found = False
+            needed_size = size * 0.9  # accept a fill within 10% of the order size
+            if fill and fill["size"] >= needed_size:
+                verified_pos = {}  # no positions() read, so no leverage from it
+                verified_size = fill["size"]
+                verified_entry = fill["avg_px"] or price
+                log.info(f"✅ Position verified from fill: {trade.side.upper()} {verified_size:.4f} ETH @ ${verified_entry:.2f}")
                 position_found = True
-                break
+            else:
+                for attempt, delay in enumerate(SETTLE_POLL_DELAYS):
+                    if attempt or not fill:
+                        await asyncio.sleep(delay + random.uniform(0, 0.1))
+                    verification = await asyncio.to_thread(ex.positions)
+                    if not verification:
+                        continue
+                    # Bind the verified position's fields once; reused for SL/TP below
+                    verified_pos = verification[0]
+                    verified_size = abs(verified_pos.get('size', 0))
+                    if verified_size >= needed_size:
+                        verified_entry = verified_pos.get('entry_price', verified_pos.get('entry', price))
+                        log.info(f"✅ Position verified: {trade.side.upper()} {verified_size:.4f} ETH @ ${verified_entry:.2f}")
+                        position_found = True
+                        break
         
-        if not position_found:
-            print(f"⚠️ Warning: Position not found after {attempt + 1} attempts. Result: {result}")
-            print("⚠️ This could mean: order rejected, position too small, or immediate liquidation")
+            if not position_found:
+                log.warning(f"⚠️ Warning: Position not found after {attempt + 1} attempts. Result: {result}")
+                log.warning("⚠️ This could mean: order rejected, position too small, or immediate liquidation")
         
-        # Record trade open
-        pnl.record_trade("open", size, price)
-        position_opened_at = time.time()  # Track when position was opened
+            position_opened_at = now  # Track when position was opened
         
-        # Send Telegram notification for opened trade
-        if telegram_bot:
-            # Leverage: attempt to read from position after verification; fallback 10x
-            lev = None
-            try:
-                poslist = ex.positions()
-                if poslist:
-                    lev = poslist[0].get("leverage") or None
-            except Exception:
-                lev = None
+            # Record trade open (P&L, guard, trade log, Telegram)
+            # Leverage: read from the verified position (no extra query), else the
+            # paper wallet's fixed setting; left out of the notice when unknown
+            lev = (verified_pos.get("leverage") if position_found else None) or getattr(ex, "leverage", None)
             why_summary = decision_raw.get("venice_reason") or (
                 "5m price-action entry; invalidation at SL"
             )
-            await telegram_bot.notify_trade_opened(
-                trade.side,
-                size,
-                price,
-                sl_pct=trade.stop_loss_pct,
-                tp_pct=trade.take_profit_pct,
-                leverage=lev if lev else 10.0,
-                why=why_summary,
+            _emit_trade_event(
+                "open",
+                # pydantic serializes the decision in one native call; orjson
+                # splices the JSON in as-is when the record is written
+                {"decision": orjson.Fragment(trade.model_dump_json()), "result": result, "price": price},
+                now, size, price,
+                notify=((trade.side, size, price), {
+                    "sl_pct": trade.stop_loss_pct,
+                    "tp_pct": trade.take_profit_pct,
+                    "leverage": lev or None,
+                    "why": why_summary,
+                }),
             )
+            log.info(f"Trade placed: {trade.side} {size:.4f} ETH (${notional_value:.2f}) @ ${price:.2f}, result={result}")
         
-        trade_log.log_trade({"decision": trade.model_dump(), "result": result, "price": price})
-        guard.record_open()
-        print(f"Trade placed: {trade.side} {size:.4f} ETH (${notional_value:.2f}) @ ${price:.2f}, result={result}")
-        
-        # Place stop loss and take profit if Claude provided them
-        if not use_paper and position_found and (trade.stop_loss_pct > 0 or trade.take_profit_pct > 0):
-            print(f"\n🛡️ Setting up risk management (SL: {trade.stop_loss_pct*100:.1f}%, TP: {trade.take_profit_pct*100:.1f}%)")
+            # Place stop loss and take profit if Claude provided them
+            if not use_paper and position_found and (trade.stop_loss_pct > 0 or trade.take_profit_pct > 0):
+                log.info(f"\n🛡️ Setting up risk management (SL: {trade.stop_loss_pct*100:.1f}%, TP: {trade.take_profit_pct*100:.1f}%)")
             
-            # Get actual entry price from verified position
-            entry_price = verified_pos.get('entry_price', verified_pos.get('entry', price))
-            actual_size = abs(verified_pos.get('size', size))
+                # Actual entry price and size from the verified position
+                entry_price = verified_entry
+                actual_size = verified_size
             
-            # Place stop loss
-            if trade.stop_loss_pct > 0:
-                if trade.side.lower() == "long":
-                    stop_price = entry_price * (1 - trade.stop_loss_pct)
-                    stop_side = "sell"
-                else:  # short
-                    stop_price = entry_price * (1 + trade.stop_loss_pct)
-                    stop_side = "buy"
-                
-                ex.place_trigger_order(
-                    symbol=settings.trading_pair,
-                    side=stop_side,
-                    size=actual_size,
-                    trigger_price=stop_price,
-                    is_stop=True,
-                    reduce_only=True
-                )
-                print(f"🛡️ Stop Loss: {stop_side.upper()} {actual_size:.4f} ETH @ ${stop_price:.2f} (-{trade.stop_loss_pct*100:.1f}% from ${entry_price:.2f})")
+                # Both triggers sit on the exit side; `sign` points away from
+                # the entry in the position's favour
+                sign = 1 if trade.side == "long" else -1
+                exit_side = "sell" if trade.side == "long" else "buy"
+                stop_price = entry_price * (1 - sign * trade.stop_loss_pct) if trade.stop_loss_pct > 0 else None
+                tp_price = entry_price * (1 + sign * trade.take_profit_pct) if trade.take_profit_pct > 0 else None
             
-            # Place take profit
-            if trade.take_profit_pct > 0:
-                if trade.side.lower() == "long":
-                    tp_price = entry_price * (1 + trade.take_profit_pct)
-                    tp_side = "sell"
-                else:  # short
-                    tp_price = entry_price * (1 - trade.take_profit_pct)
-                    tp_side = "buy"
-                
-                ex.place_trigger_order(
-                    symbol=settings.trading_pair,
-                    side=tp_side,
-                    size=actual_size,
-                    trigger_price=tp_price,
-                    is_stop=False,
-                    reduce_only=True
+                # One signed request for both, off the event loop
+                tpsl_result = await asyncio.to_thread(
+                    ex.place_tpsl_orders, pair, exit_side, actual_size, stop_price, tp_price
                 )
-                print(f"🎯 Take Profit: {tp_side.upper()} {actual_size:.4f} ETH @ ${tp_price:.2f} (+{trade.take_profit_pct*100:.1f}% from ${entry_price:.2f})")
+                if stop_price is not None:
+                    log.info(f"🛡️ Stop Loss: {exit_side.upper()} {actual_size:.4f} ETH @ ${stop_price:.2f} (-{trade.stop_loss_pct*100:.1f}% from ${entry_price:.2f})")
+                if tp_price is not None:
+                    log.info(f"🎯 Take Profit: {exit_side.upper()} {actual_size:.4f} ETH @ ${tp_price:.2f} (+{trade.take_profit_pct*100:.1f}% from ${entry_price:.2f})")
             
-            print(f"✅ Risk management orders placed successfully\n")
-
-        # After any close, check daily loss vs limit and trigger shutdown if exceeded
-        day_pnl = risk_manager.get_day_pnl()
-        # Use starting equity from pnl tracker as baseline for simplicity
-        start_eq = pnl.get_stats().get("starting_equity", 0)
-        if start_eq > 0 and day_pnl <= -settings.daily_loss_limit_pct * start_eq:
-            print(f"🛑 Max daily loss reached ({day_pnl/start_eq*100:.2f}%), initiating shutdown and closing positions")
-            # Close any open position
-            open_positions = ex.positions()
-            if open_positions:
-                market_price = price
-                if use_paper:
-                    ex.close_position(settings.trading_pair, price=market_price)
+                # The bulk request can succeed while single orders are rejected;
+                # those carry an "error" in their per-order status. A rejected
+                # request has a plain message string as its "response"
+                response = tpsl_result.get("response")
+                data = response.get("data") if isinstance(response, dict) else None
+                statuses = data.get("statuses", []) if isinstance(data, dict) else []
+                order_errors = [st["error"] for st in statuses if isinstance(st, dict) and "error" in st]
+                if tpsl_result.get("status") == "ok" and not order_errors:
+                    log.info(f"✅ Risk management orders placed successfully\n")
                 else:
-                    ex.close_position(settings.trading_pair)
-                position_opened_at = None  # Reset position timer
-                # Clear AI history after emergency close
-                history.clear_history()
-            # Set shutdown window and notify
-            risk_manager.shutdown_for(settings.shutdown_duration_hours * 3600)
-            if telegram_bot:
-                await telegram_bot.notify_shutdown(
-                    reason=f"Daily loss exceeded {settings.daily_loss_limit_pct*100:.1f}%",
-                    hours=settings.shutdown_duration_hours,
-                )
-            # Sleep longer during shutdown
-            await asyncio.sleep(600)
-            continue
+                    log.warning(f"⚠️ Risk management orders failed, relying on the loop's SL/TP check: {order_errors or tpsl_result}")
 
-        # Dynamic wait: 5 min scan when flat & cooldown passed, 15 min when monitoring
-        if current_position:
-            # Monitoring mode: check every 15 minutes to avoid over-management
-            print(f"📊 Next check in 15 minutes (monitoring position)")
-            await asyncio.sleep(900)
-        elif guard.allow_new_trade():
-            # No position and cooldown passed: scan every 5 minutes
-            print(f"🔍 Next scan in 5 minutes (no position, seeking entry)")
-            await asyncio.sleep(300)
-        else:
-            # Just opened a trade: wait full cooldown
-            print(f"⏸️ Next scan in {settings.cooldown_minutes} minutes (post-trade cooldown)")
-            await asyncio.sleep(settings.cooldown_minutes * 60)
+            # After any close, check daily loss vs limit and trigger shutdown if exceeded
+            day_pnl = risk_manager.get_day_pnl(now)
+            # Use starting equity from pnl tracker as baseline for simplicity
+            start_eq = pnl.get_stats().get("starting_equity", 0)
+            if start_eq > 0 and day_pnl <= -daily_loss_limit * start_eq:
+                log.warning(f"🛑 Max daily loss reached ({day_pnl/start_eq*100:.2f}%), initiating shutdown and closing positions")
+                # Close any open position
+                open_positions = await asyncio.to_thread(ex.positions)
+                if open_positions:
+                    market_price = await _current_price(spot, candle_cache, tf)
+                    if use_paper:
+                        await asyncio.to_thread(ex.close_position, pair, price=market_price)
+                    else:
+                        await asyncio.to_thread(ex.close_position, pair)
+                    position_opened_at = None  # Reset position timer
+                    account_cache.invalidate()
+                    # Clear AI history after emergency close
+                    history.clear_history()
+                # Set shutdown window and notify
+                risk_manager.shutdown_for(settings.shutdown_duration_hours * 3600, now)
+                if telegram_bot:
+                    _notify(
+                        "notify_shutdown",
+                        reason=f"Daily loss exceeded {daily_loss_limit*100:.1f}%",
+                        hours=settings.shutdown_duration_hours,
+                    )
+                # Sleep longer during shutdown
+                next_wake, wake_on_bar = loop.time() + 600, False
+                continue
+
+            # Dynamic wait, aligned to candle closes: each 5m close when flat & cooldown
+            # passed, each 15m close when monitoring
+            if current_position:
+                # Monitoring mode: check every 15 minutes to avoid over-management
+                log.info(f"📊 Next check at the next 15-minute candle close (monitoring position)")
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(900), False
+            elif guard.allow_new_trade(now):
+                # No position and cooldown passed: scan on every candle close
+                log.info(f"🔍 Next scan at the next candle close (no position, seeking entry)")
+                next_wake, wake_on_bar = loop.time() + _until_candle_close(), True
+            else:
+                # Just opened a trade: wait out the cooldown, then for the candle close after it
+                wait = _until_candle_close(after=now + guard.seconds_until_allowed(now))
+                log.info(f"⏸️ Next scan in {wait/60:.1f} minutes (post-trade cooldown)")
+                next_wake, wake_on_bar = loop.time() + wait, False
 
 
 def run_live():
-    """Entry point that runs the async trading loop"""
-    asyncio.run(run_live_async())
+    """Entry point that runs the async trading loop (on uvloop when installed)"""
+    try:
+        import uvloop
+    except ImportError:
+        run = asyncio.run
+    else:
+        run = uvloop.run
+    try:
+        run(run_live_async())
+    finally:
+        _stop_logging()
 
 
 if __name__ == "__main__":
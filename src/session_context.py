@@ -5,11 +5,20 @@ Fractals near session extremes behave differently.
 Middle of range = garbage. Extremes = high probability.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Final, List, Optional
 import numpy as np
 from datetime import datetime, timedelta
 import pytz
 
+from .indicators import candles_to_array, candle_timestamps, HIGH, LOW, CLOSE
+
+
+# Position-in-range bounds (fraction of session range)
+UPPER_THIRD: Final[float] = 0.66
+LOWER_THIRD: Final[float] = 0.33
+NEAR_HIGH: Final[float] = 0.90
+NEAR_LOW: Final[float] = 0.10
+
 
 class SessionContext:
     """
@@ -17,6 +26,25 @@ class SessionContext:
     Provides context about where price is relative to session structure.
     """
     
+    # Aliases of the module-level bounds, kept for external callers
+    UPPER_THIRD = UPPER_THIRD
+    LOWER_THIRD = LOWER_THIRD
+    NEAR_HIGH = NEAR_HIGH
+    NEAR_LOW = NEAR_LOW
+    
+    # Result when there is not enough data to define a session
+    EMPTY_RESULT = {
+        "session_high": None,
+        "session_low": None,
+        "session_range": None,
+        "current_position": "unknown",
+        "position_pct": 0.5,
+        "distance_to_high": None,
+        "distance_to_low": None,
+        "near_extreme": False,
+        "extreme_type": "none"
+    }
+    
     def __init__(
         self,
         timezone: str = "America/New_York",
@@ -53,45 +81,24 @@ class SessionContext:
                 - extreme_type: str (high/low/none)
         """
         if len(candles) < 10:
-            return {
-                "session_high": None,
-                "session_low": None,
-                "session_range": None,
-                "current_position": "unknown",
-                "position_pct": 0.5,
-                "distance_to_high": None,
-                "distance_to_low": None,
-                "near_extreme": False,
-                "extreme_type": "none"
-            }
+            return dict(self.EMPTY_RESULT)
         
-        # Get session candles
-        session_candles = self._get_session_candles(candles)
+        # Parse once, then select the session rows from the same block
+        session = candles_to_array(candles)[self._session_mask(candles)]
         
-        if not session_candles:
-            return {
-                "session_high": None,
-                "session_low": None,
-                "session_range": None,
-                "current_position": "unknown",
-                "position_pct": 0.5,
-                "distance_to_high": None,
-                "distance_to_low": None,
-                "near_extreme": False,
-                "extreme_type": "none"
-            }
+        if not len(session):
+            return dict(self.EMPTY_RESULT)
         
-        # Calculate session high and low
-        highs = [float(c['high']) for c in session_candles]
-        lows = [float(c['low']) for c in session_candles]
+        # Calculate session high and low (C-level reductions over the parsed block)
         
-        session_high = max(highs)
-        session_low = min(lows)
+        session_high = float(session[:, HIGH].max())
+        session_low = float(session[:, LOW].min())
         session_range = session_high - session_low
         
         # Use current price or last close
+        # (the last candle always falls inside the current session)
         if current_price is None:
-            current_price = float(candles[-1]['close'])
+            current_price = float(session[-1, CLOSE])
         
         # Calculate position within range
         if session_range > 0:
@@ -100,9 +107,9 @@ class SessionContext:
             position_pct = 0.5
         
         # Determine position (upper/middle/lower third)
-        if position_pct >= 0.66:
+        if position_pct >= UPPER_THIRD:
             current_position = "upper"
-        elif position_pct <= 0.33:
+        elif position_pct <= LOWER_THIRD:
             current_position = "lower"
         else:
             current_position = "middle"
@@ -112,14 +119,13 @@ class SessionContext:
         distance_to_low = current_price - session_low
         
         # Determine if near extreme (within 10% of range)
-        near_extreme = position_pct >= 0.90 or position_pct <= 0.10
-        
-        if position_pct >= 0.90:
+        if position_pct >= NEAR_HIGH:
             extreme_type = "high"
-        elif position_pct <= 0.10:
+        elif position_pct <= NEAR_LOW:
             extreme_type = "low"
         else:
             extreme_type = "none"
+        near_extreme = extreme_type != "none"
         
         return {
             "session_high": session_high,
@@ -133,18 +139,21 @@ class SessionContext:
             "distance_to_low_pct": distance_to_low / session_range if session_range > 0 else 0,
             "near_extreme": near_extreme,
             "extreme_type": extreme_type,
-            "session_candle_count": len(session_candles)
+            "session_candle_count": len(session)
         }
     
-    def _get_session_candles(self, candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _session_mask(self, candles: List[Dict[str, Any]]) -> np.ndarray:
         """
-        Filter candles to only include those in the current session(s).
+        Boolean mask of the candles that fall in the current session(s).
         """
         if not candles:
-            return []
+            return np.zeros(0, dtype=bool)
+        
+        # Timestamps parsed once; key style detected on the first candle
+        timestamps = candle_timestamps(candles)
         
         # Get current time
-        last_candle_ts = candles[-1].get('ts', candles[-1].get('time', 0))
+        last_candle_ts = timestamps[-1]
         current_dt = datetime.fromtimestamp(last_candle_ts / 1000, tz=pytz.UTC)
         current_dt = current_dt.astimezone(self.timezone)
         
@@ -168,13 +177,7 @@ class SessionContext:
         session_start_utc = session_start.astimezone(pytz.UTC)
         session_start_ts = int(session_start_utc.timestamp() * 1000)
         
-        # Filter candles
-        session_candles = [
-            c for c in candles
-            if c.get('ts', c.get('time', 0)) >= session_start_ts
-        ]
-        
-        return session_candles
+        return timestamps >= session_start_ts
     
     def should_trade_at_level(self, analysis: Dict[str, Any], direction: str) -> Dict[str, bool]:
         """
@@ -20,11 +20,14 @@ class TradingTelegramBot:
         chat_id: str,
         hyperliquid_client: HyperliquidClient,
         pnl_tracker: PnLTracker,
+        scan_requested: Optional[asyncio.Event] = None,
     ):
         self.telegram_token = telegram_token
         self.chat_id = chat_id
         self.hyperliquid = hyperliquid_client
         self.pnl_tracker = pnl_tracker
+        # Set by /scan; the live loop cuts its current wait short when it fires
+        self.scan_requested = scan_requested
         self.app = Application.builder().token(telegram_token).build()
         
         # Register command handlers
@@ -34,6 +37,7 @@ class TradingTelegramBot:
         self.app.add_handler(CommandHandler("status", self.cmd_status))
         self.app.add_handler(CommandHandler("withdraw", self.cmd_withdraw))
         self.app.add_handler(CommandHandler("deposit", self.cmd_deposit))
+        self.app.add_handler(CommandHandler("scan", self.cmd_scan))
 
     async def start(self):
         """Start the Telegram bot"""
@@ -49,6 +53,7 @@ class TradingTelegramBot:
             ("status", "Show bot status"),
             ("deposit", "Show deposit address"),
             ("withdraw", "Withdraw USDC (usage: /withdraw <amount> <address>)"),
+            ("scan", "Run a market scan now instead of waiting"),
         ]
         await self.app.bot.set_my_commands(commands)
         logger.info("🤖 Telegram bot started with commands")
@@ -234,6 +239,14 @@ class TradingTelegramBot:
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {e}")
 
+    async def cmd_scan(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Wake the trading loop for an immediate scan (cooldowns still apply)"""
+        if self.scan_requested is None:
+            await update.message.reply_text("⚠️ Manual scans are not available")
+            return
+        self.scan_requested.set()
+        await update.message.reply_text("🔍 Scanning now...")
+
     # Notification Methods
     async def notify_trade_opened(self, side: str, size: float, price: float, sl_pct: float = 0.0, tp_pct: float = 0.0, leverage: Optional[float] = 10.0, why: Optional[str] = None):
         """Send notification when trade is opened"""
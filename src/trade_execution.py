@@ -7,10 +7,12 @@ EXECUTION LOGIC (WHERE MOST BOTS DIE):
 - Time-based stops: exit if no movement within N candles
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import numpy as np
 from datetime import datetime
 
+from .indicators import candles_to_array, true_range, HIGH, LOW, CLOSE
+
 
 class TradeExecution:
     """
@@ -68,10 +70,12 @@ class TradeExecution:
                 "reason": "Insufficient data for execution calculation"
             }
         
-        current_price = float(candles[-1]['close'])
+        # Only the ATR window is needed: slice and parse it once
+        tail = candles_to_array(candles[-self.atr_period-1:])
+        current_price = float(tail[-1, CLOSE])
         
         # Calculate ATR for volatility-adjusted stops
-        atr = self._calculate_current_atr(candles)
+        atr = self._calculate_current_atr(tail)
         
         # Determine entry price based on entry mode
         if self.entry_mode == "break_retest":
@@ -133,21 +137,17 @@ class TradeExecution:
             "entry_mode": self.entry_mode
         }
     
-    def _calculate_current_atr(self, candles: List[Dict[str, Any]]) -> float:
-        """Calculate current ATR value"""
-        highs = np.array([float(c['high']) for c in candles[-self.atr_period-1:]])
-        lows = np.array([float(c['low']) for c in candles[-self.atr_period-1:]])
-        closes = np.array([float(c['close']) for c in candles[-self.atr_period-1:]])
+    def _calculate_current_atr(self, candles: Union[np.ndarray, List[Dict[str, Any]]]) -> float:
+        """Calculate current ATR value (from an OHLC array or raw candle dicts)"""
+        tail = candles[-self.atr_period-1:]
+        if not isinstance(tail, np.ndarray):
+            tail = candles_to_array(tail)
+        highs = tail[:, HIGH]
+        lows = tail[:, LOW]
+        closes = tail[:, CLOSE]
         
         # Calculate True Range
-        tr = np.zeros(len(highs))
-        tr[0] = highs[0] - lows[0]
-        
-        for i in range(1, len(highs)):
-            hl = highs[i] - lows[i]
-            hc = abs(highs[i] - closes[i-1])
-            lc = abs(lows[i] - closes[i-1])
-            tr[i] = max(hl, hc, lc)
+        tr = true_range(highs, lows, closes)
         
         # Return average of recent true ranges
         return np.mean(tr[-self.atr_period:])
@@ -1,7 +1,8 @@
-import json
 import os
 import time
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import orjson
 
 
 class TradeLogger:
@@ -15,21 +16,21 @@ class TradeLogger:
         entries: List[Dict] = []
         if not os.path.exists(self.path):
             return entries
-        with open(self.path, "r", encoding="utf-8") as fh:
+        with open(self.path, "rb") as fh:
             for line in fh:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError:
+                    entries.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
                     continue
         return entries
 
     def _write_entries(self, entries: List[Dict]) -> None:
-        with open(self.path, "w", encoding="utf-8") as fh:
+        with open(self.path, "wb") as fh:
             for entry in entries:
-                fh.write(json.dumps(entry) + "\n")
+                fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
 
     def rollover_if_needed(self) -> None:
         entries = self._read_entries()
@@ -43,18 +44,27 @@ class TradeLogger:
         carried = [e for e in entries if e.get("ts", 0) >= cutoff]
         archive_path = f"{self.path}.archive"
         try:
-            with open(archive_path, "a", encoding="utf-8") as fh:
+            with open(archive_path, "ab") as fh:
                 for entry in entries:
-                    fh.write(json.dumps(entry) + "\n")
+                    fh.write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
         except OSError:
             pass
         self._write_entries(carried)
 
     def log_trade(self, trade: Dict) -> None:
+        self.log_batch([(time.time(), trade)])
+
+    def log_batch(self, records: List[Tuple[float, Dict]]) -> None:
+        """Append (ts, trade) records with one rollover check and one write."""
+        if not records:
+            return
         self.rollover_if_needed()
-        entry = {"ts": time.time(), "trade": trade}
-        with open(self.path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(entry) + "\n")
+        data = b"".join(
+            orjson.dumps({"ts": ts, "trade": trade}, option=orjson.OPT_APPEND_NEWLINE)
+            for ts, trade in records
+        )
+        with open(self.path, "ab") as fh:
+            fh.write(data)
 
     def recent_trades(self, hours: int = 24) -> List[Dict]:
         entries = self._read_entries()
@@ -5,9 +5,16 @@ The bot may only trade nested fractals when volatility is NOT compressed.
 Low volatility = spreads eat you, breakouts fail, fractals become meaningless geometry.
 """
 
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Dict, Final, List, Union
 import numpy as np
 
+from .indicators import candles_to_array, ema_recurrence, true_range, HIGH, LOW, CLOSE
+
+
+# ATR ratio above which volatility counts as expanding (120% of average)
+EXPANSION_RATIO: Final[float] = 1.2
+
 
 class VolatilityGate:
     """
@@ -33,6 +40,15 @@ class VolatilityGate:
         self.lookback_period = atr_period * lookback_multiplier
         self.compression_threshold = compression_threshold
         self.require_expansion = require_expansion
+        # EMA smoothing coefficients, fixed per gate
+        self._multiplier = 2 / (atr_period + 1)
+        self._keep = 1 - self._multiplier
+        
+        # Streaming ATR state, committed up to the last *closed* candle.
+        # The newest candle is still forming, so it is recomputed every call.
+        self._closed_ts = None
+        self._closed_close = 0.0
+        self._atr_tail = deque(maxlen=self.lookback_period)
     
     def check(self, candles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -57,8 +73,8 @@ class VolatilityGate:
                 "state": "unknown"
             }
         
-        # Calculate ATR for all candles
-        atr_values = self._calculate_atr(candles, self.atr_period)
+        # ATR for the lookback window (streamed when only new candles arrived)
+        atr_values = self._recent_atr(candles)
         
         # Current ATR (most recent)
         current_atr = atr_values[-1]
@@ -73,7 +89,7 @@ class VolatilityGate:
         # Determine state
         if ratio < self.compression_threshold:
             state = "compressed"
-        elif ratio > 1.2:  # Expanding if > 120% of average
+        elif ratio > EXPANSION_RATIO:
             state = "expanding"
         else:
             state = "normal"
@@ -114,36 +130,61 @@ class VolatilityGate:
             "is_transitioning": is_transitioning if self.require_expansion else None
         }
     
-    def _calculate_atr(self, candles: List[Dict[str, Any]], period: int) -> np.ndarray:
+    def _recent_atr(self, candles: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        ATR values for the last `lookback_period` candles.
+        
+        When the previous call already covered every closed candle except at
+        most one, the ATR is advanced with an O(1) EMA step instead of being
+        recomputed over the whole history. Otherwise (first call, gap in
+        timestamps, candles without 'ts') it falls back to a full recompute.
+        """
+        prev_ts = candles[-2].get('ts')
+        if self._closed_ts is not None and prev_ts is not None:
+            if candles[-3].get('ts') == self._closed_ts:
+                # One more candle closed since the last call
+                self._atr_tail.append(self._step_atr(candles[-2]))
+                self._closed_close = float(candles[-2]['close'])
+                self._closed_ts = prev_ts
+            if prev_ts == self._closed_ts:
+                live_atr = self._step_atr(candles[-1])
+                return np.array(list(self._atr_tail)[1:] + [live_atr])
+        
+        # Full recompute, then seed the streaming state from closed candles
+        ohlc = candles_to_array(candles)
+        atr_values = self._calculate_atr(ohlc, self.atr_period)
+        self._atr_tail = deque(atr_values[:-1][-self.lookback_period:].tolist(), maxlen=self.lookback_period)
+        self._closed_close = float(ohlc[-2, CLOSE])
+        self._closed_ts = prev_ts
+        return atr_values[-self.lookback_period:]
+    
+    def _step_atr(self, candle: Dict[str, Any]) -> float:
+        """Advance the ATR EMA by one candle from the committed closed state."""
+        high = float(candle['high'])
+        low = float(candle['low'])
+        tr = max(high - low, abs(high - self._closed_close), abs(low - self._closed_close))
+        return (tr * self._multiplier) + (self._atr_tail[-1] * self._keep)
+    
+    def _calculate_atr(self, candles: Union[np.ndarray, List[Dict[str, Any]]], period: int) -> np.ndarray:
         """
         Calculate Average True Range (ATR) for candles.
         
+        Accepts an OHLC array from candles_to_array or raw candle dicts.
+        
         True Range = max(high - low, abs(high - prev_close), abs(low - prev_close))
         ATR = moving average of True Range
         """
-        highs = np.array([float(c['high']) for c in candles])
-        lows = np.array([float(c['low']) for c in candles])
-        closes = np.array([float(c['close']) for c in candles])
+        ohlc = candles if isinstance(candles, np.ndarray) else candles_to_array(candles)
+        highs = ohlc[:, HIGH]
+        lows = ohlc[:, LOW]
+        closes = ohlc[:, CLOSE]
         
         # Calculate True Range
-        tr = np.zeros(len(candles))
-        tr[0] = highs[0] - lows[0]  # First candle has no previous close
-        
-        for i in range(1, len(candles)):
-            hl = highs[i] - lows[i]
-            hc = abs(highs[i] - closes[i-1])
-            lc = abs(lows[i] - closes[i-1])
-            tr[i] = max(hl, hc, lc)
-        
-        # Calculate ATR using exponential moving average
-        atr = np.zeros(len(candles))
-        atr[period-1] = np.mean(tr[:period])
-        
-        multiplier = 2 / (period + 1)
-        for i in range(period, len(candles)):
-            atr[i] = (tr[i] * multiplier) + (atr[i-1] * (1 - multiplier))
+        tr = true_range(highs, lows, closes)
         
-        return atr
+        # Calculate ATR using exponential moving average, seeded with the SMA
+        alpha = self._multiplier if period == self.atr_period else 2 / (period + 1)
+        return ema_recurrence(tr, alpha, float(np.mean(tr[:period])), period)
     
     def get_normalized_leg_size(self, candles: List[Dict[str, Any]], start_idx: int, end_idx: int) -> float:
         """
@@ -162,11 +203,12 @@ class VolatilityGate:
             return 0.0
         
         # Calculate ATR
-        atr_values = self._calculate_atr(candles, self.atr_period)
+        ohlc = candles_to_array(candles)
+        atr_values = self._calculate_atr(ohlc, self.atr_period)
         
         # Get price change
-        start_price = float(candles[start_idx]['close'])
-        end_price = float(candles[end_idx]['close'])
+        start_price = ohlc[start_idx, CLOSE]
+        end_price = ohlc[end_idx, CLOSE]
         price_change = abs(end_price - start_price)
         
         # Normalize by ATR at the end of the leg